@@ -1,10 +1,43 @@
 import requests
 import webbrowser
+import argparse
+import atexit
+import bisect
+import contextlib
+import contextvars
+import gc
+import io
+import itertools
 import os
+import pathlib
 import sys
 import shutil
-from datetime import datetime, timezone
-from bs4 import BeautifulSoup
+import time
+import json
+import queue
+import random
+import math
+import re
+import hashlib
+import html
+import importlib
+import importlib.util
+import sqlite3
+import struct
+import subprocess
+import tempfile
+import threading
+import tracemalloc
+import unicodedata
+import zlib
+from collections import defaultdict, deque, namedtuple
+from email.utils import parsedate_to_datetime
+from urllib.parse import parse_qs, parse_qsl, urlencode, urlsplit, urlunsplit
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 # --- CONFIGURATION & FILE MANAGEMENT ---
 
@@ -20,8 +53,31 @@ os.makedirs(CLAIMER_DIR, exist_ok=True) # Ensure the directory exists
 
 # Define the location for the configuration and log files
 CLAIMED_FILE = os.path.join(CLAIMER_DIR, "claimed_games.txt")
+CLAIMS_DB_PATH = os.path.join(CLAIMER_DIR, "claimed_games.db")
 CONFIG_FILE_PATH = os.path.join(CLAIMER_DIR, 'claimer_config.txt')
-LOG_FILE_PATH = os.path.join(CLAIMER_DIR, 'claimer_log.txt')
+LOG_FILE_PATH = os.path.join(CLAIMER_DIR, 'claimer_log.jsonl')
+LEGACY_LOG_FILE_PATH = os.path.join(CLAIMER_DIR, 'claimer_log.txt')
+
+# The claim log rotates to claimer_log.1.jsonl, claimer_log.2.jsonl, ... once it grows past this size
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUP_COUNT = 50
+
+# Claims are written in batches of this many entries (and whenever a claim session ends)
+LOG_BUFFER_SIZE = 20
+
+# Every Nth entry of a log file is recorded in its .idx file, so date lookups can seek close to it
+LOG_INDEX_EVERY = 256
+
+# Entries shown per page in the log viewer
+LOG_PAGE_SIZE = 20
+
+# Incremental backups: files are split into chunks, and each distinct chunk is stored once, compressed
+BACKUP_REPO_DIR = os.path.join(DOWNLOADS_PATH, 'FreeGamesClaimer_Backups')
+BACKUP_CHUNK_SIZE = 256 * 1024
+BACKUP_KEEP = 10 # Number of incremental backups kept, older ones are pruned
+
+# Folders inside CLAIMER_DIR that are only caches and are left out of incremental backups
+BACKUP_EXCLUDE = {'http_cache', 'claim_pages'}
 
 # Default configuration settings
 DEFAULT_CONFIG = {
@@ -31,7 +87,7 @@ DEFAULT_CONFIG = {
 # --- STORE API / URLS ---
 
 EPIC_API = "https://store-site-backend-static.ak.epicgames.com/freeGamesPromotions?locale=en-US&country=US&allowCountries=US"
-STEAM_URL = "https://store.steampowered.com/search/?maxprice=free&specials=1"
+STEAM_SEARCH_API = "https://store.steampowered.com/search/results/?query=&maxprice=free&specials=1&infinite=1"
 GOG_URL = "https://www.gog.com/en"
 UBISOFT_URL = "https://store.ubisoft.com/us/free-games"
 
@@ -39,6 +95,58 @@ headers = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 }
 
+# --- SCAN SETTINGS ---
+
+# Network timeout for every store request in seconds: (connect, read)
+REQUEST_TIMEOUT = (5, 15)
+
+# How long each store may take before we give up on it for this run (seconds)
+STORE_DEADLINES = {
+    'Epic Games': 20,
+    'Steam': 20,
+    'GOG.com': 20,
+    'Ubisoft': 20,
+}
+DEFAULT_STORE_DEADLINE = 20
+
+# Hard limit for the whole scan, no matter how many stores are still running (seconds)
+SCAN_DEADLINE = 30
+
+# Epic regions to check as (locale, country). Promotions differ per country, offers are merged by Epic id.
+# Example: [('en-US', 'US'), ('en-GB', 'GB'), ('de', 'DE')]
+EPIC_REGIONS = [('en-US', 'US')]
+EPIC_REGION_WORKERS = 4
+
+# Steam search results are fetched page by page, a few pages at a time
+STEAM_PAGE_SIZE = 50
+STEAM_MAX_PAGES = 20
+STEAM_PAGE_WORKERS = 4
+
+# --- HTTP CACHE SETTINGS ---
+
+# Store responses are kept here so unchanged pages only cost a 304 on the next scan
+HTTP_CACHE_DIR = os.path.join(CLAIMER_DIR, 'http_cache')
+HTTP_CACHE_ENABLED = True
+
+# Retries for connection errors and temporary server errors, with jittered exponential backoff
+HTTP_RETRIES = 3
+HTTP_BACKOFF_FACTOR = 0.5
+HTTP_MAX_BACKOFF = 30 # Longer Retry-After waits aren't slept through, the host is skipped until then instead
+
+# --- REQUEST SCHEDULING SETTINGS ---
+
+# Requests per second and burst size allowed per host, so paging through Steam doesn't trip its rate limit
+HOST_RATE_LIMITS = {
+    'store.steampowered.com': (2, 4),
+    'store.ubisoft.com': (1, 2),
+}
+DEFAULT_HOST_RATE_LIMIT = (4, 8)
+
+# After this many failed requests in a row a host counts as unhealthy. Until the cooldown
+# is over its last good (cached) responses are served instead of asking it again
+CIRCUIT_FAILURE_THRESHOLD = 3
+CIRCUIT_COOLDOWN = 5 * 60
+
 # --- CONFIG & LOGGING FUNCTIONS ---
 
 def load_config():
@@ -68,46 +176,278 @@ def save_config(config_data):
     except Exception as e:
         print(f"Warning: Could not save configuration to {CONFIG_FILE_PATH}. Error: {e}")
 
-def log_claim(title, url):
-    """Appends the claimed game and URL to the log file."""
+_log_buffer = []
+_log_lock = threading.Lock()
+_log_record_count = None # Entries in the active log file, worked out on the first write
+
+def _log_segments():
+    """Returns the claim log files from oldest to newest."""
+    base, ext = os.path.splitext(LOG_FILE_PATH)
+    rotated = [f"{base}.{number}{ext}" for number in range(LOG_BACKUP_COUNT, 0, -1)]
+    return [path for path in rotated + [LOG_FILE_PATH] if os.path.exists(path)]
+
+def _read_log_index(path):
+    """Returns the (entry number, byte offset, timestamp) checkpoints of a log file."""
+    checkpoints = []
     try:
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_entry = f"[{timestamp}] CLAIMED: {title:<50} | URL: {url}\n"
-        with open(LOG_FILE_PATH, 'a', encoding='utf-8') as f:
-            f.write(log_entry)
-    except Exception as e:
-        print(f"Warning: Failed to write to log file. Error: {e}")
+        with open(path + '.idx', 'r', encoding='utf-8') as f:
+            for line in f:
+                number, offset, timestamp = line.rstrip('\n').split('\t', 2)
+                checkpoints.append((int(number), int(offset), timestamp))
+    except (OSError, ValueError):
+        pass
+    return checkpoints
+
+def _count_log_records():
+    """Counts the entries in the active log file, starting from its last index checkpoint."""
+    checkpoints = _read_log_index(LOG_FILE_PATH)
+    number, offset = (checkpoints[-1][0], checkpoints[-1][1]) if checkpoints else (0, 0)
+    try:
+        with open(LOG_FILE_PATH, 'rb') as f:
+            f.seek(offset)
+            return number + sum(1 for _ in f)
+    except FileNotFoundError:
+        return 0
+
+def _rotate_log():
+    """Moves the active log file (and its index) to claimer_log.1.jsonl, shifting older files up."""
+    base, ext = os.path.splitext(LOG_FILE_PATH)
+    for number in range(LOG_BACKUP_COUNT, 0, -1):
+        source = LOG_FILE_PATH if number == 1 else f"{base}.{number - 1}{ext}"
+        target = f"{base}.{number}{ext}"
+        for suffix in ('', '.idx'):
+            if os.path.exists(source + suffix):
+                os.replace(source + suffix, target + suffix)
+            elif os.path.exists(target + suffix):
+                os.remove(target + suffix)
+
+def _migrate_legacy_log():
+    """Converts the old free-text claimer_log.txt into the structured log, once."""
+    if not os.path.exists(LEGACY_LOG_FILE_PATH) or os.path.exists(LOG_FILE_PATH):
+        return
+    pattern = re.compile(r"^\[(.*?)\] CLAIMED: (.*?)\s*\| URL: (.*)$")
+    records = []
+    with open(LEGACY_LOG_FILE_PATH, 'r', encoding='utf-8') as f:
+        for line in f:
+            match = pattern.match(line.rstrip('\n'))
+            if match:
+                timestamp, title, url = match.groups()
+                records.append(_log_record(title, url, timestamp.replace(' ', 'T')))
+    _write_log_records(records)
+    os.replace(LEGACY_LOG_FILE_PATH, LEGACY_LOG_FILE_PATH + '.migrated')
+    print(f"📦 Moved {len(records)} entries from the old claim log into the new format.")
+
+def _log_record(title, url, timestamp=None):
+    """Builds one structured claim log entry."""
+    key = offer_key(url)
+    return {
+        'ts': timestamp or datetime.now().isoformat(timespec='seconds'),
+        'store': key[0] if key else '',
+        'title': title,
+        'url': url,
+    }
+
+def _write_log_records(records):
+    """Appends entries to the active log file, rotating it and updating its index as needed."""
+    global _log_record_count
+    if not records:
+        return
+    if _log_record_count is None:
+        _log_record_count = _count_log_records()
+
+    pending = deque(records)
+    while pending:
+        if os.path.exists(LOG_FILE_PATH) and os.path.getsize(LOG_FILE_PATH) >= LOG_MAX_BYTES:
+            _rotate_log()
+            _log_record_count = 0
+
+        checkpoints = []
+        with open(LOG_FILE_PATH, 'ab') as f:
+            offset = f.tell()
+            while pending and offset < LOG_MAX_BYTES:
+                record = pending.popleft()
+                if _log_record_count % LOG_INDEX_EVERY == 0:
+                    checkpoints.append(f"{_log_record_count}\t{offset}\t{record['ts']}\n")
+                line = (json.dumps(record, ensure_ascii=False) + "\n").encode('utf-8')
+                f.write(line)
+                offset += len(line)
+                _log_record_count += 1
+        if checkpoints:
+            with open(LOG_FILE_PATH + '.idx', 'a', encoding='utf-8') as f:
+                f.writelines(checkpoints)
+
+def log_claim(title, url):
+    """Queues the claimed game and URL for the log file, writing a batch once enough have piled up."""
+    with _log_lock:
+        _log_buffer.append(_log_record(title, url))
+        if len(_log_buffer) < LOG_BUFFER_SIZE:
+            return
+    flush_claim_log()
+
+def flush_claim_log():
+    """Writes any queued claim log entries to disk."""
+    with _log_lock:
+        records = list(_log_buffer)
+        _log_buffer.clear()
+        if not records:
+            return
+        try:
+            os.makedirs(CLAIMER_DIR, exist_ok=True)
+            _migrate_legacy_log()
+            _write_log_records(records)
+        except Exception as e:
+            print(f"Warning: Failed to write to log file. Error: {e}")
+
+atexit.register(flush_claim_log)
+
+def _read_lines_backwards(path, block_size=64 * 1024):
+    """Yields the lines of a file from last to first, reading it in blocks from the end."""
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        remainder = b''
+        while position > 0:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            lines = (f.read(read_size) + remainder).split(b'\n')
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                if line:
+                    yield line.decode('utf-8')
+        if remainder:
+            yield remainder.decode('utf-8')
+
+def iter_claim_log(since=None, until=None, store=None, title=None, newest_first=False):
+    """
+    Yields claim log entries matching the filters, without loading whole files.
+    since/until are ISO timestamps or dates ('2026-01-31'); store and title are case-insensitive substrings.
+    """
+    flush_claim_log()
+    _migrate_legacy_log()
+    store = store.lower() if store else None
+    title = title.lower() if title else None
+    # A bare date as the upper bound means "until the end of that day"
+    if until and len(until) == 10:
+        until += 'T23:59:59'
+
+    def matches(record):
+        if since and record['ts'] < since:
+            return False
+        if until and record['ts'] > until:
+            return False
+        if store and store not in record.get('store', '').lower():
+            return False
+        if title and title not in record.get('title', '').lower():
+            return False
+        return True
+
+    segments = _log_segments()
+    if newest_first:
+        for path in reversed(segments):
+            for line in _read_lines_backwards(path):
+                record = json.loads(line)
+                if since and record['ts'] < since:
+                    return # Everything further back is older still
+                if matches(record):
+                    yield record
+        return
+
+    for position, path in enumerate(segments):
+        checkpoints = _read_log_index(path)
+        # Skip whole files that end before the range starts (the next file starts after this one ends)
+        if since and position + 1 < len(segments):
+            next_checkpoints = _read_log_index(segments[position + 1])
+            if next_checkpoints and next_checkpoints[0][2] < since:
+                continue
+
+        offset = 0
+        if since and checkpoints:
+            timestamps = [checkpoint[2] for checkpoint in checkpoints]
+            index = bisect.bisect_left(timestamps, since) - 1
+            offset = checkpoints[max(index, 0)][1]
+
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                record = json.loads(line)
+                if until and record['ts'] > until:
+                    return # The log is in time order, nothing later can match
+                if matches(record):
+                    yield record
+
+def _print_log_records(records):
+    """Prints claim log entries in the familiar one-line format."""
+    for record in records:
+        timestamp = record['ts'].replace('T', ' ')
+        print(f"[{timestamp}] CLAIMED: {record['title']:<50} | URL: {record['url']}")
 
 def view_log():
-    """Reads and displays the claim log file content."""
+    """Shows the claim log: the latest entries, page by page, or filtered by date, store or title."""
     try:
-        with open(LOG_FILE_PATH, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        if not content.strip():
-            print("\n😏 The claim log file is empty. No recent claims logged.")
+        flush_claim_log()
+        _migrate_legacy_log()
+        if not _log_segments():
+            print(f"\n😏 The log file hasn't been created yet. You need to enable logging (L) and run a claim first!")
+            return
+
+        print("\nT. Latest claims   P. Page through everything   F. Filter by date, store or title")
+        choice = input("How do you want to view the log? (T, P or F): ").strip().upper()
+
+        if choice == 'F':
+            since = input("From date (YYYY-MM-DD, blank for any): ").strip() or None
+            until = input("Until date (YYYY-MM-DD, blank for any): ").strip() or None
+            store = input("Store (epic, steam, gog, ubisoft, blank for any): ").strip() or None
+            title = input("Title contains (blank for any): ").strip() or None
+            records = iter_claim_log(since=since, until=until, store=store, title=title)
+        elif choice == 'P':
+            records = iter_claim_log(newest_first=True)
+        else:
+            records = iter_claim_log(newest_first=True)
+            latest = list(itertools.islice(records, LOG_PAGE_SIZE))
+            if not latest:
+                print("\n😏 The claim log file is empty. No recent claims logged.")
+                return
+            print("\n--- Game Claim Log 📄 (latest first) ---")
+            _print_log_records(latest)
+            print("----------------------------")
             return
 
         print("\n--- Game Claim Log 📄 ---")
-        print(content)
+        shown = 0
+        while True:
+            page = list(itertools.islice(records, LOG_PAGE_SIZE))
+            _print_log_records(page)
+            shown += len(page)
+            if len(page) < LOG_PAGE_SIZE:
+                break
+            if input(f"-- {shown} shown. ENTER for more, Q to stop: ").strip().upper() == 'Q':
+                break
+        if not shown:
+            print("No claims match that.")
         print("----------------------------")
 
-    except FileNotFoundError:
-        print(f"\n😏 The log file hasn't been created yet. You need to enable logging (L) and run a claim first!")
     except Exception as e:
         print(f"Error reading log file: {e}")
 
 def clear_log():
-    """Prompts the user for confirmation and deletes the log file."""
+    """Prompts the user for confirmation and deletes the log files."""
+    global _log_record_count
     try:
-        if not os.path.exists(LOG_FILE_PATH):
+        flush_claim_log()
+        segments = _log_segments()
+        if not segments and not os.path.exists(LEGACY_LOG_FILE_PATH):
             print(f"\n😏 The log file hasn't been created yet. Nothing to delete!")
             return
 
         while True:
             action = input("\n🚨 ARE YOU SURE you want to delete the claim log forever? (Y/N): ").strip().upper()
             if action == 'Y':
-                os.remove(LOG_FILE_PATH)
+                for path in segments + [LEGACY_LOG_FILE_PATH]:
+                    for suffix in ('', '.idx'):
+                        if os.path.exists(path + suffix):
+                            os.remove(path + suffix)
+                _log_record_count = None
                 print(f"🔥 Claim log file deleted!")
                 break
             elif action == 'N':
@@ -151,342 +491,3148 @@ def create_backup():
         print(f"\n🚨 An error occurred during backup: {e}")
 
 
-# --- GAME DATA UTILITIES ---
+def _backup_object_path(chunk_hash):
+    """Returns where a chunk is stored in the backup repository."""
+    return os.path.join(BACKUP_REPO_DIR, 'objects', chunk_hash[:2], chunk_hash)
 
-def load_claimed_games():
-    print("📂 Loading previously claimed games...")
-    if os.path.exists(CLAIMED_FILE):
-        with open(CLAIMED_FILE, "r", encoding="utf-8") as f:
-            return set(line.strip().lower() for line in f if line.strip())
-    return set()
-
-def save_claimed_games(titles):
-    print(f"💾 Saving {len(titles)} newly claimed games to file...")
-    os.makedirs(CLAIMER_DIR, exist_ok=True)
-    with open(CLAIMED_FILE, "a", encoding="utf-8") as f:
-        for title in titles:
-            f.write(title + "\n")
+def _list_snapshots():
+    """Returns the incremental backup manifests, oldest first."""
+    snapshot_dir = os.path.join(BACKUP_REPO_DIR, 'snapshots')
+    if not os.path.isdir(snapshot_dir):
+        return []
+    return sorted(os.path.join(snapshot_dir, name) for name in os.listdir(snapshot_dir) if name.endswith('.json'))
 
-# --- GAME CHECKER FUNCTIONS (Updated Epic) ---
+def _load_snapshot(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
 
-def parse_epic_date(date_str):
-    """Parses ISO date string from Epic API and returns a timezone-aware datetime object."""
-    try:
-        # datetime.fromisoformat handles the 'Z' in Python 3.11+, 
-        # but for broader compatibility, we handle it manually.
-        if date_str.endswith('Z'):
-            date_str = date_str.rstrip('Z')
-        
-        # Parse, then set the timezone to UTC (since Epic's API dates are in UTC/Z)
-        dt = datetime.fromisoformat(date_str)
-        return dt.replace(tzinfo=timezone.utc)
-    except ValueError:
-        # Handle cases with or without milliseconds
-        if '.' in date_str:
-            return datetime.strptime(date_str.split('.')[0], "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc)
-        return datetime.strptime(date_str, "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc)
+def _backup_source_files():
+    """Yields (relative path, absolute path) for every file that goes into an incremental backup."""
+    for root, dirs, files in os.walk(CLAIMER_DIR):
+        if root == CLAIMER_DIR:
+            dirs[:] = [name for name in dirs if name not in BACKUP_EXCLUDE]
+        for name in sorted(files):
+            if name.endswith('.tmp') or name.endswith('-journal'):
+                continue
+            path = os.path.join(root, name)
+            yield os.path.relpath(path, CLAIMER_DIR).replace(os.sep, '/'), path
 
+def _store_chunks(stream, stats):
+    """Splits a stream into chunks, stores the ones the repository doesn't have yet and returns their hashes."""
+    chunks = []
+    while True:
+        data = stream.read(BACKUP_CHUNK_SIZE)
+        if not data:
+            break
+        chunk_hash = hashlib.sha256(data).hexdigest()
+        chunks.append(chunk_hash)
+        object_path = _backup_object_path(chunk_hash)
+        if os.path.exists(object_path):
+            stats['reused'] += 1
+            continue
+        os.makedirs(os.path.dirname(object_path), exist_ok=True)
+        compressed = zlib.compress(data, 6)
+        _write_atomic(object_path, compressed, mode='wb')
+        stats['stored'] += 1
+        stats['stored_bytes'] += len(compressed)
+    return chunks
 
-def get_epic_free_games():
+def create_incremental_backup(verbose=True):
     """
-    Fetches all currently active 100% free-to-claim games from the Epic Games Store API.
-    Uses multi-stage checking and timezone-aware date comparison for max resilience.
+    Backs up the claimer folder into the backup repository, storing only chunks that changed
+    since earlier backups. Files whose size and modification time are unchanged aren't even read.
     """
-    print("🛍️ Checking Epic Games Store (using max resilience API method)...")
-    free_games = []
-    claimed_titles = load_claimed_games()
-    now_utc = datetime.now(timezone.utc)
-    
     try:
-        response = requests.get(EPIC_API, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-        
-        elements = data.get('data', {}).get('Catalog', {}).get('searchStore', {}).get('elements', [])
-        
-        for game_data in elements:
-            title = game_data.get('title', 'Unknown Title')
-            is_currently_free = False
-            
-            # 1. Get the best possible URL slug (Prioritize human-readable slug from mappings)
-            product_slug = None
-            
-            # 1a. **PRIORITY**: Check the 'mappings' which often contain the clean, human-readable slug.
-            if game_data.get('catalogNs', {}).get('mappings'):
-                for mapping in game_data['catalogNs']['mappings']:
-                    # Look for the primary store page slug
-                    if mapping.get('pageType') in ['productHome', 'product']:
-                        temp_slug = mapping.get('pageSlug')
-                        # Heuristic: Prefer the clean slug (contains hyphens or is short) over a long UUID slug.
-                        if temp_slug and ('-' in temp_slug or len(temp_slug) < 15): 
-                            product_slug = temp_slug
-                            break # Found a good candidate, stop looking in mappings
-            
-            # 1b. FALLBACK: Use generic product/url slugs if no good mapping was found (this often gives the UUID)
-            if not product_slug:
-                if game_data.get("productSlug"):
-                    product_slug = game_data["productSlug"]
-                elif game_data.get("urlSlug"):
-                    product_slug = game_data["urlSlug"]
-            
-            if not product_slug:
+        os.makedirs(os.path.join(BACKUP_REPO_DIR, 'snapshots'), exist_ok=True)
+        flush_claim_log()
+        snapshots = _list_snapshots()
+        previous = {}
+        if snapshots:
+            previous = {entry['path']: entry for entry in _load_snapshot(snapshots[-1])['files']}
+
+        stats = {'files': 0, 'unchanged': 0, 'stored': 0, 'reused': 0, 'stored_bytes': 0}
+        files = []
+        for relative_path, path in _backup_source_files():
+            info = os.stat(path)
+            stats['files'] += 1
+            old = previous.get(relative_path)
+            if old and old['size'] == info.st_size and old['mtime'] == info.st_mtime_ns:
+                files.append(old)
+                stats['unchanged'] += 1
                 continue
 
-            # 2. **PRIMARY CHECK:** Check if the price object itself indicates 100% off.
-            price_data = game_data.get('price', {}).get('totalPrice', {})
-            if price_data.get('discountPercentage') == 0 and price_data.get('originalPrice') > 0:
-                # If the price object shows a discount of 100% and it's not a permanently free game (original price > 0)
-                is_currently_free = True
-            
-            # 3. **SECONDARY CHECK:** Fallback to the complex promotions object if primary check fails.
-            if not is_currently_free:
-                promotions = game_data.get('promotions')
-
-                # Check both current and *immediate* upcoming offers
-                for offer_type in ['promotionalOffers', 'upcomingPromotionalOffers']:
-                    offer_list = promotions.get(offer_type, []) if promotions else []
-                    if not offer_list:
-                        continue
-                        
-                    for offer_group in offer_list:
-                        for offer in offer_group.get('promotionalOffers', []):
-                            discount = offer.get('discountSetting', {}).get('discountPercentage')
-                            start_date_str = offer.get('startDate')
-                            end_date_str = offer.get('endDate')
-                            
-                            if discount == 0 and start_date_str and end_date_str: # 100% free
-                                try:
-                                    start_date = parse_epic_date(start_date_str)
-                                    end_date = parse_epic_date(end_date_str)
-                                    
-                                    # Check if current time is within the free claim window
-                                    if start_date <= now_utc < end_date:
-                                        is_currently_free = True
-                                        break
-                                except Exception:
-                                    # Silently skip on date parsing error
-                                    continue
-                        if is_currently_free:
-                            break
-                    if is_currently_free:
-                        break
-            
-            # 4. Add to list if free and not claimed
-            if is_currently_free and product_slug and title.lower() not in claimed_titles:
-                # Clean the slug and form the URL
-                slug_base = product_slug.split('/')[0] if '/' in product_slug else product_slug
-                game_url = f"https://store.epicgames.com/en-US/p/{slug_base}"
-                free_games.append((title, game_url))
-                
-    except requests.RequestException as e:
-        print(f"❌ Error checking Epic Games Store (Network/API issue): {e}")
+            if path.endswith('.db'):
+                # Copy databases through SQLite, so the backup never catches them halfway through a write
+                with tempfile.TemporaryDirectory() as temp_dir:
+                    copy_path = os.path.join(temp_dir, 'copy.db')
+                    source, target = sqlite3.connect(path), sqlite3.connect(copy_path)
+                    try:
+                        source.backup(target)
+                    finally:
+                        target.close()
+                        source.close()
+                    with open(copy_path, 'rb') as f:
+                        chunks = _store_chunks(f, stats)
+            else:
+                with open(path, 'rb') as f:
+                    chunks = _store_chunks(f, stats)
+            files.append({'path': relative_path, 'size': info.st_size, 'mtime': info.st_mtime_ns, 'chunks': chunks})
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        manifest = {'created': datetime.now().isoformat(timespec='seconds'), 'files': files}
+        _write_atomic(os.path.join(BACKUP_REPO_DIR, 'snapshots', f"{timestamp}.json"), json.dumps(manifest))
+        pruned = prune_backups()
+
+        if verbose:
+            print("-" * 50)
+            print("🎉 **INCREMENTAL BACKUP SUCCESSFUL** 🎉")
+            print(f"Files: {stats['files']} ({stats['unchanged']} unchanged since the last backup)")
+            print(f"New data: {stats['stored']} chunks, {stats['stored_bytes'] / 1024:.1f} KiB compressed "
+                  f"({stats['reused']} chunks already stored)")
+            if pruned:
+                print(f"Pruned {pruned} old backups (keeping {BACKUP_KEEP}).")
+            print(f"Saved to: **{BACKUP_REPO_DIR}**")
+            print("-" * 50)
+        return stats
+
     except Exception as e:
-        print(f"❌ An unexpected error occurred while parsing Epic Games data: {e}")
-        
-    return free_games
+        print(f"\n🚨 An error occurred during backup: {e}")
+        return None
 
+def prune_backups(keep=None):
+    """Deletes all but the newest `keep` incremental backups and the chunks only they used."""
+    keep = BACKUP_KEEP if keep is None else keep
+    snapshots = _list_snapshots()
+    expired = snapshots[:-keep] if keep > 0 else snapshots
+    if not expired:
+        return 0
+    for path in expired:
+        os.remove(path)
 
-def get_steam_free_games():
+    referenced = set()
+    for path in _list_snapshots():
+        for entry in _load_snapshot(path)['files']:
+            referenced.update(entry['chunks'])
+
+    objects_dir = os.path.join(BACKUP_REPO_DIR, 'objects')
+    for root, _, names in os.walk(objects_dir):
+        for name in names:
+            if name not in referenced:
+                os.remove(os.path.join(root, name))
+    return len(expired)
+
+def restore_backup(snapshot_path=None, target_dir=None):
     """
-    Checks the Steam search page for games listed as 'Free'.
-    ⚠️ NOTE: Web scraping is **fragile** and may break if Steam updates its site layout.
+    Restores an incremental backup (the newest one by default) into a new folder in Downloads,
+    streaming and checking every chunk. Returns the folder it restored into.
     """
-    print("🔥 Checking Steam Store (web scraping, potentially fragile)...")
-    games = []
     try:
-        response = requests.get(STEAM_URL, headers=headers)
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            game_rows = soup.find_all('a', class_='search_result_row')
-            for game in game_rows[:5]: # Limit to first few results
-                title = game.find('span', class_='title').text.strip()
-                link = game['href']
-                # Check for "Free" or similar in the price container
-                price_tag = game.find('div', class_='search_price')
-                if price_tag and ('Free' in price_tag.text or '$0.00' in price_tag.text):
-                    games.append((title, link.split('?')[0])) # Clean the URL
+        snapshots = _list_snapshots()
+        if not snapshots:
+            print("\n😏 There are no incremental backups yet. Make one first (I)!")
+            return None
+        snapshot_path = snapshot_path or snapshots[-1]
+        manifest = _load_snapshot(snapshot_path)
+        if target_dir is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            target_dir = os.path.join(DOWNLOADS_PATH, f"FreeGamesClaimer_Restore_{timestamp}")
+
+        for entry in manifest['files']:
+            path = os.path.join(target_dir, *entry['path'].split('/'))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                for chunk_hash in entry['chunks']:
+                    with open(_backup_object_path(chunk_hash), 'rb') as chunk_file:
+                        data = zlib.decompress(chunk_file.read())
+                    if hashlib.sha256(data).hexdigest() != chunk_hash:
+                        raise ValueError(f"Backup chunk {chunk_hash[:12]} is damaged ({entry['path']})")
+                    f.write(data)
+
+        print("-" * 50)
+        print("🎉 **RESTORE SUCCESSFUL** 🎉")
+        print(f"Backup from: **{manifest['created']}** ({len(manifest['files'])} files)")
+        print(f"Restored to: **{target_dir}**")
+        print("Copy the files back into your Documents/Free Games Claimer folder to use them.")
+        print("-" * 50)
+        return target_dir
+
     except Exception as e:
-        print(f"❌ Error checking Steam: {e}")
-    return games
+        print(f"\n🚨 An error occurred during restore: {e}")
+        return None
 
-def get_gog_free_games():
+def choose_and_restore_backup():
+    """Lists the incremental backups and restores the one the user picks."""
+    snapshots = _list_snapshots()
+    if not snapshots:
+        print("\n😏 There are no incremental backups yet. Make one first (I)!")
+        return
+    print("\n--- Incremental Backups 💾 ---")
+    for number, path in enumerate(reversed(snapshots), start=1):
+        manifest = _load_snapshot(path)
+        print(f"{number}. {manifest['created']} ({len(manifest['files'])} files)")
+    choice = input("Which backup should be restored? (ENTER for the newest): ").strip()
+    if not choice:
+        restore_backup(snapshots[-1])
+    elif choice.isdigit() and 1 <= int(choice) <= len(snapshots):
+        restore_backup(snapshots[-int(choice)])
+    else:
+        print("That’s not on the list.")
+
+# --- GAME DATA UTILITIES ---
+
+# Number of new claims between two compactions of the claim database
+CLAIMS_COMPACT_EVERY = 500
+
+# Known store hosts, used to build stable (store, product id) keys from claim URLs
+STORE_HOSTS = {
+    'store.epicgames.com': 'epic',
+    'store.steampowered.com': 'steam',
+    'www.gog.com': 'gog',
+    'store.ubisoft.com': 'ubisoft',
+}
+
+# How similar two normalized titles must be (0-1, trigram Dice score) to count as the same game.
+# 1.0 turns fuzzy matching off and only accepts identical normalized titles.
+CLAIM_MATCH_THRESHOLD = 0.85
+
+# Bump when normalize_title() changes, so stored title keys are rebuilt once
+TITLE_KEY_VERSION = 3
+
+_claims_lock = threading.RLock()
+_claims_db = None
+_claimed_titles = None
+_claimed_offers = None
+
+# Store labels and other bracketed notes, e.g. "(GOG GIVEAWAY)" or "[Free Weekend]"
+_TITLE_TAGS = re.compile(r"[\(\[\{][^\)\]\}]*[\)\]\}]")
+# Edition suffixes that don't make a different game, e.g. "- Definitive Edition" or ": GOTY"
+_TITLE_EDITIONS = re.compile(
+    r"(?:\s*[:\-\u2013\u2014]\s*|\s+)"
+    r"(?:(?:game of the year|goty|definitive|deluxe|digital deluxe|complete|ultimate|gold|standard"
+    r"|enhanced|special|anniversary|collector'?s)\s+edition|goty)\s*$"
+)
+# 'v' and 'x' are left alone, they're often a letter ("Mega Man X") rather than a number
+_ROMAN_NUMERALS = {'ii': '2', 'iii': '3', 'iv': '4', 'vi': '6', 'vii': '7', 'viii': '8', 'ix': '9'}
+# Words that tell sequels apart: numbers, and anything that reads like a roman numeral (incl. "v" and "x")
+_DISTINGUISHING_TOKEN = re.compile(r"\d+|(?=[ivx])x{0,3}(?:ix|iv|v?i{0,3})")
+
+def normalize_title(title):
     """
-    Attempts to scrape the main GOG page for a giveaway banner.
-    ⚠️ NOTE: GOG's site is highly dynamic. This method is highly **unreliable**.
+    Returns the canonical key used to compare game titles: lowercase, no accents, symbols,
+    store tags or edition suffixes, and roman numerals as digits ("Hades II" -> "hades 2").
     """
-    print("🌙 Checking GOG.com (web scraping, highly unreliable)...")
-    games = []
-    try:
-        response = requests.get(GOG_URL, headers=headers)
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            # Look for giveaway sections
-            giveaway_section = soup.select_one('.product-tile-container--giveaway')
-            if giveaway_section:
-                link_tag = giveaway_section.select_one('a')
-                title_tag = giveaway_section.select_one('.product-tile__title')
-                if link_tag and title_tag:
-                    title = title_tag.text.strip() + " (GOG GIVEAWAY)"
-                    link = "https://www.gog.com" + link_tag['href']
-                    games.append((title, link))
-    except Exception as e:
-        print(f"❌ Error checking GOG: {e}")
-    return games
+    text = title.replace('™', '').replace('®', '').replace('©', '')
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(char for char in text if not unicodedata.combining(char)).lower()
+    text = _TITLE_TAGS.sub(' ', text)
+    while True:
+        stripped = _TITLE_EDITIONS.sub('', text)
+        if stripped == text:
+            break
+        text = stripped
+    text = text.replace("'", '').replace('\u2019', '').replace('&', ' and ')
+    text = re.sub(r"[^\w\s]|_", ' ', text)
+    # Numerals only count after a title word, a title that is just "II" stays as it is
+    words = text.split()
+    words = words[:1] + [_ROMAN_NUMERALS.get(word, word) for word in words[1:]]
+    return ' '.join(words) or ' '.join(title.lower().split())
 
-def get_ubisoft_free_games():
+def _distinguishing_tokens(key):
+    """Returns the number-like words of a title key, in order: "mega man x legacy" -> ['x']."""
+    return [word for word in key.split() if _DISTINGUISHING_TOKEN.fullmatch(word)]
+
+def _title_trigrams(key):
+    """Returns the set of character trigrams of a title key, padded so word edges count too."""
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class TitleIndex:
     """
-    Attempts to scrape the Ubisoft free games page.
-    ⚠️ NOTE: Web scraping is **fragile** and may break if Ubisoft updates its site layout.
+    Set of normalized titles with a trigram index, so a title can be matched against a large
+    claimed history by similarity while only looking at titles that share trigrams with it.
     """
-    print("🎮 Checking Ubisoft Store (web scraping, potentially fragile)...")
-    games = []
-    try:
-        response = requests.get(UBISOFT_URL, headers=headers)
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, "html.parser")
-            # Look for product tiles where the price is free
-            for card in soup.select("div.product-tile"):
-                price_tag = card.select_one("div.product-tile__price span")
-                if price_tag and 'free' in price_tag.text.lower():
-                    title_tag = card.select_one("span.product-tile-title")
-                    link_tag = card.find("a", href=True)
-                    if title_tag and link_tag:
-                        title = title_tag.text.strip()
-                        url = "https://store.ubisoft.com" + link_tag['href']
-                        games.append((title, url))
-    except Exception as e:
-        print(f"❌ Error checking Ubisoft: {e}")
-    return games
 
-# --- CORE LOGIC ---
+    def __init__(self, keys=()):
+        self._keys = set()
+        self._trigrams = {}
+        self._postings = defaultdict(set)
+        for key in keys:
+            self.add(key)
 
-def notify(config):
-    """Checks and opens links for unclaimed free games."""
-    print("\n🎮 Checking REAL free games only... ✨", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+    def __contains__(self, key):
+        return key in self._keys
 
-    claimed_titles = load_claimed_games()
+    def __iter__(self):
+        return iter(self._keys)
 
-    epic_games = get_epic_free_games()
-    steam_games = get_steam_free_games()
-    gog_games = get_gog_free_games()
-    ubisoft_games = get_ubisoft_free_games()
+    def __len__(self):
+        return len(self._keys)
 
-    def filter_claimed(games):
-        return [(title, url) for title, url in games if title.lower() not in claimed_titles]
+    def add(self, key):
+        if key in self._keys:
+            return
+        self._keys.add(key)
+        grams = frozenset(_title_trigrams(key))
+        self._trigrams[key] = grams
+        for gram in grams:
+            self._postings[gram].add(key)
 
-    # Epic function already includes claimed check, but we run it again for consistency
-    epic_games = filter_claimed(epic_games)
-    steam_games = filter_claimed(steam_games)
-    gog_games = filter_claimed(gog_games)
-    ubisoft_games = filter_claimed(ubisoft_games)
+    def find_similar(self, key, threshold=None):
+        """Returns the most similar stored key with a Dice score of at least threshold, or None."""
+        threshold = CLAIM_MATCH_THRESHOLD if threshold is None else threshold
+        if key in self._keys:
+            return key
+        if threshold >= 1 or not self._keys:
+            return None
 
-    def show(name, games):
-        if games:
-            print(f"\n💫 {name}")
-            for title, url in games:
-                print(f"- {title}: {url}")
-        else:
-            print(f"\n😔 No new freebies on {name} right now.")
+        grams = _title_trigrams(key)
+        # A Dice score >= threshold is only possible for titles of roughly the same trigram count
+        low = len(grams) * threshold / (2 - threshold)
+        high = len(grams) * (2 - threshold) / threshold
+        # ...sharing at least this many trigrams, so every match has to contain one of the
+        # (len - min_shared + 1) rarest trigrams. Only those postings are scanned.
+        min_shared = math.ceil(threshold * (len(grams) + low) / 2)
+        rarest = sorted(grams, key=lambda gram: len(self._postings.get(gram, ())))
+        candidates = set()
+        for gram in rarest[:max(1, len(grams) - min_shared + 1)]:
+            candidates.update(self._postings.get(gram, ()))
 
-    show("Epic Games", epic_games)
-    show("Steam", steam_games)
-    show("GOG.com", gog_games)
-    show("Ubisoft", ubisoft_games)
+        tokens = _distinguishing_tokens(key)
+        best, best_score = None, threshold
+        for candidate in candidates:
+            candidate_grams = self._trigrams[candidate]
+            if not low <= len(candidate_grams) <= high:
+                continue
+            score = 2 * len(grams & candidate_grams) / (len(grams) + len(candidate_grams))
+            # Different numbers mean a different game ("Hades 2" is not "Hades", "Final Fantasy X"
+            # is not "Final Fantasy"), however similar
+            if score >= best_score and _distinguishing_tokens(candidate) == tokens:
+                best, best_score = candidate, score
+        return best
 
-    all_games = epic_games + steam_games + gog_games + ubisoft_games
+# (claimed title, new title, should the new one count as claimed) pairs checked by --benchmark
+TITLE_MATCH_CHECKS = [
+    ("Hades", "Hades II", False),
+    ("Mega Man Legacy Collection", "Mega Man X Legacy Collection", False),
+    ("Mega Man 10", "Mega Man X", False),
+    ("Final Fantasy", "Final Fantasy X", False),
+    ("Grand Theft Auto", "Grand Theft Auto V", False),
+    ("Metal Gear Solid", "Metal Gear Solid V", False),
+    ("The Witcher 3: Wild Hunt", "The Witcher® 3: Wild Hunt - Game of the Year Edition", True),
+    ("Hades II", "Hades 2", True),
+    ("Tom Clancy's Rainbow Six Siege", "Tom Clancys Rainbow Six: Siege", True),
+]
 
-    if all_games:
-        print(f"\n✨ Found {len(all_games)} unclaimed free games! Ready to open? Press ENTER to begin batch magic, or type 'no' to skip.")
-        newly_claimed = []
-        
-        games_to_open = list(all_games)
-        
-        while True:
-            choice = input("> ").strip().lower()
-            if choice == "no":
-                print("💤 Okayy, skipped this time...")
-                break
-            
-            if not games_to_open:
-                print("\nAll games already opened!")
-                input("Press ENTER to return to menu.")
-                break
+def check_title_matching():
+    """Runs TITLE_MATCH_CHECKS and returns the (claimed, new, expected) pairs that came out wrong."""
+    failures = []
+    for claimed, title, expected in TITLE_MATCH_CHECKS:
+        index = TitleIndex([normalize_title(claimed)])
+        if (index.find_similar(normalize_title(title)) is not None) != expected:
+            failures.append((claimed, title, expected))
+    return failures
 
-            # Process games in batches of 5
-            batch = games_to_open[:5]
-            games_to_open = games_to_open[5:]
+def offer_key(url):
+    """
+    Derives a stable (store, product id) pair from a store page URL.
+    Returns None if the URL doesn't look like a product page.
+    """
+    if not url:
+        return None
+    parts = urlsplit(url)
+    host = parts.netloc.lower()
+    store = STORE_HOSTS.get(host, host)
+    segments = [segment for segment in parts.path.lower().split('/') if segment]
+    if not store or not segments:
+        return None
 
-            print(f"🌐 Opening next {len(batch)} games...")
-            for title, url in batch:
-                print(f"🔗 Opening: {title}")
-                webbrowser.open(url)
-                newly_claimed.append(title.lower())
-                
-                # --- LOGGING CLAIMED GAME ---
-                if config['logging_enabled']:
-                    log_claim(title, url)
-                # ----------------------------
+    # Steam URLs carry the numeric app id, the trailing name slug can change
+    if store == 'steam' and len(segments) >= 2 and segments[0] in ('app', 'sub', 'bundle'):
+        return store, f"{segments[0]}/{segments[1]}"
+    # Epic and GOG prefix the product slug with a locale / section, keep only the product part
+    if store == 'epic' and 'p' in segments[:-1]:
+        return store, segments[segments.index('p') + 1]
+    if store == 'gog' and 'game' in segments[:-1]:
+        return store, 'game/' + segments[segments.index('game') + 1]
+    return store, '/'.join(segments)
 
-            if games_to_open:
-                print(f"\n⏭️ {len(games_to_open)} more remaining. Press ENTER for next batch.")
-            else:
-                print("\n🎉 All done opening! Wasn't that fun?")
-                input("Press ENTER to wrap it up.")
-                break
+def _open_claims_db():
+    """
+    Opens (and creates, if needed) the claim database and migrates the old text file once.
+    The connection is shared, callers must hold _claims_lock while they use it.
+    """
+    global _claims_db
+    with _claims_lock:
+        if _claims_db is not None:
+            return _claims_db
 
-        save_claimed_games(newly_claimed)
-    else:
-        print("\n😢 No new games today... we'll check again soon 💖")
-        input("\nPress ENTER to return to menu.")
+        os.makedirs(CLAIMER_DIR, exist_ok=True)
+        db = sqlite3.connect(CLAIMS_DB_PATH, check_same_thread=False)
+        db.executescript("""
+            CREATE TABLE IF NOT EXISTS claims (
+                id INTEGER PRIMARY KEY,
+                store TEXT,
+                offer_id TEXT,
+                title TEXT NOT NULL,
+                title_key TEXT NOT NULL,
+                claimed_at TEXT NOT NULL
+            );
+            CREATE UNIQUE INDEX IF NOT EXISTS claims_offer ON claims(store, offer_id) WHERE offer_id IS NOT NULL;
+            CREATE UNIQUE INDEX IF NOT EXISTS claims_title_only ON claims(title_key) WHERE offer_id IS NULL;
+            CREATE INDEX IF NOT EXISTS claims_title ON claims(title_key);
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+        """)
 
-# --- MENU FUNCTIONS ---
+        migrated = db.execute("SELECT value FROM meta WHERE key = 'migrated_text_file'").fetchone()
+        if not migrated and os.path.exists(CLAIMED_FILE):
+            print("📦 Moving your claimed games history into the new claim database (one time only)...")
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            with open(CLAIMED_FILE, "r", encoding="utf-8") as f:
+                rows = [(line.strip(), normalize_title(line), timestamp) for line in f if line.strip()]
+            with db:
+                db.executemany(
+                    "INSERT OR IGNORE INTO claims (title, title_key, claimed_at) VALUES (?, ?, ?)", rows
+                )
+                db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_text_file', ?)", (timestamp,))
+            print(f"✅ Migrated {len(rows)} entries from {os.path.basename(CLAIMED_FILE)}.")
 
-def show_menu(logging_status):
-    """Displays the main menu."""
-    log_state = "ON 📝" if logging_status else "OFF 👻"
-    
-    print("\n--- Free Games Claimer Menu ---")
-    print("1. Start Claiming Games 🚀")
-    print(f"L. Toggle Claim Logging (Current Status: {log_state})")
-    print("V. View Claim Log 📄")
-    print("C. Clear Claim Log 🔥")
-    print("Z. Backup Claimer Files 💾 (to Downloads as ZIP)")
-    print("0. Exit 😢")
-    print("-----------------------------")
+        # GOG offer ids used to keep the locale ("en/game/foo"), the same product is "game/foo" now
+        with db:
+            db.execute(
+                "UPDATE OR IGNORE claims SET offer_id = substr(offer_id, instr(offer_id, '/game/') + 1) "
+                "WHERE store = 'gog' AND offer_id LIKE '%/game/%'"
+            )
+            db.execute("DELETE FROM claims WHERE store = 'gog' AND offer_id LIKE '%/game/%'")
 
-# Main Execution
-if __name__ == "__main__":
-    
-    # 1. Load configuration
-    config = load_config()
+        version = db.execute("SELECT value FROM meta WHERE key = 'title_key_version'").fetchone()
+        if not version or version[0] != str(TITLE_KEY_VERSION):
+            _rekey_claims(db)
 
-    # 2. Main menu loop
-    while True:
-        try:
-            show_menu(config['logging_enabled'])
-            choice = input("\nType your choice (1, L, V, C, Z, or 0): ").strip().upper()
+        _claims_db = db
+        return db
 
-            if choice == '0':
-                print("Okay, exiting...")
-                break
-            
-            elif choice == '1':
-                notify(config)
-                
-            elif choice == 'L':
-                config['logging_enabled'] = not config['logging_enabled']
-                save_config(config)
-                log_state = "ON 📝" if config['logging_enabled'] else "OFF 👻"
-                print(f"\n📢 Logging is now **{log_state}**! Configuration saved.")
-                
-            elif choice == 'V':
-                view_log()
-                
-            elif choice == 'C':
-                clear_log()
-                
-            elif choice == 'Z':
-                create_backup()
+def _rekey_claims(db):
+    """Rebuilds every stored title key with the current normalize_title(), merging title-only duplicates."""
+    rows = db.execute("SELECT id, offer_id, title FROM claims ORDER BY id").fetchall()
+    seen, updates, duplicates = set(), [], []
+    for row_id, offer_id, title in rows:
+        key = normalize_title(title)
+        if offer_id is None:
+            if key in seen:
+                duplicates.append((row_id,))
+                continue
+            seen.add(key)
+        updates.append((key, row_id))
+    with db:
+        db.executemany("DELETE FROM claims WHERE id = ?", duplicates)
+        # Give every row a temporary unique key first, so the unique index can't trip halfway through
+        db.execute("UPDATE claims SET title_key = '#' || id")
+        db.executemany("UPDATE claims SET title_key = ? WHERE id = ?", updates)
+        db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('title_key_version', ?)", (str(TITLE_KEY_VERSION),))
+
+def _load_claims_index():
+    """Loads the claim database into memory once per process for O(1) lookups."""
+    global _claimed_titles, _claimed_offers
+    with _claims_lock:
+        if _claimed_titles is None:
+            print("📂 Loading previously claimed games...")
+            db = _open_claims_db()
+            titles, offers = TitleIndex(), set()
+            for store, offer_id, title_key in db.execute("SELECT store, offer_id, title_key FROM claims"):
+                titles.add(title_key)
+                if offer_id is not None:
+                    offers.add((store, offer_id))
+            _claimed_titles, _claimed_offers = titles, offers
+    return _claimed_titles, _claimed_offers
+
+def load_claimed_games():
+    """Returns the TitleIndex of normalized titles that were already claimed."""
+    return _load_claims_index()[0]
+
+def is_claimed(title, url=None):
+    """
+    Checks whether a game was already claimed: by store product id, by normalized title,
+    or by a similar enough title (see CLAIM_MATCH_THRESHOLD).
+    """
+    titles, offers = _load_claims_index()
+    key = offer_key(url)
+    if key is not None and key in offers:
+        return True
+    return titles.find_similar(normalize_title(title)) is not None
+
+def save_claimed_games(games):
+    """
+    Records newly claimed games. Accepts (title, url) pairs or plain titles.
+    Games that are already in the claim database are skipped.
+    """
+    print(f"💾 Saving {len(games)} newly claimed games to the claim database...")
+    titles, offers = _load_claims_index()
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    rows = []
+    for game in games:
+        title, url = (game, None) if isinstance(game, str) else game
+        key = offer_key(url)
+        title_key = normalize_title(title)
+        if (key is not None and key in offers) or (key is None and title_key in titles):
+            continue
+        store, offer_id = key if key is not None else (None, None)
+        rows.append((store, offer_id, title, title_key, timestamp))
+        titles.add(title_key)
+        if key is not None:
+            offers.add(key)
+
+    if not rows:
+        return
+
+    with _claims_lock:
+        db = _open_claims_db()
+        with db:
+            db.executemany(
+                "INSERT OR IGNORE INTO claims (store, offer_id, title, title_key, claimed_at) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            row = db.execute("SELECT value FROM meta WHERE key = 'inserts_since_compact'").fetchone()
+            inserts = (int(row[0]) if row else 0) + len(rows)
+            db.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('inserts_since_compact', ?)",
+                (str(inserts),),
+            )
+        if inserts >= CLAIMS_COMPACT_EVERY:
+            compact_claims()
+
+def compact_claims():
+    """Drops duplicate title-only rows already covered by a product entry and rebuilds the database file."""
+    with _claims_lock:
+        db = _open_claims_db()
+        with db:
+            db.execute("""
+                DELETE FROM claims
+                WHERE offer_id IS NULL
+                  AND title_key IN (SELECT title_key FROM claims WHERE offer_id IS NOT NULL)
+            """)
+            db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('inserts_since_compact', '0')")
+        db.execute("VACUUM")
+
+# --- SCAN METRICS ---
+
+# Each scan writes a JSON report and a Prometheus textfile (for node_exporter's textfile collector) here
+METRICS_DIR = os.path.join(CLAIMER_DIR, 'metrics')
+METRICS_REPORT_PATH = os.path.join(METRICS_DIR, 'last_run.json')
+METRICS_PROM_PATH = os.path.join(METRICS_DIR, 'claimer.prom')
+METRICS_ENABLED = True
+
+# Metrics of the store the current thread is working for (also carried into helper threads)
+_current_metrics = contextvars.ContextVar('current_metrics', default=None)
+
+# Per-store metrics of the most recent scan
+LAST_SCAN_METRICS = {}
+
+class StoreMetrics:
+    """Collects stage timings, traffic, result counts and errors for one store during one scan."""
+
+    def __init__(self, store):
+        self.store = store
+        self.status = 'ok'
+        self.stages = {}
+        self.bytes = 0
+        self.requests = 0
+        self.cache_hits = 0
+        self.found = 0
+        self.unclaimed = 0
+        self.errors = {}
+        self._lock = threading.Lock()
+
+    def add_stage(self, stage, seconds):
+        with self._lock:
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def add_request(self, num_bytes, from_cache=False):
+        with self._lock:
+            self.requests += 1
+            self.bytes += num_bytes
+            if from_cache:
+                self.cache_hits += 1
+
+    def add_error(self, error):
+        with self._lock:
+            name = type(error).__name__
+            self.errors[name] = self.errors.get(name, 0) + 1
+
+    def as_dict(self):
+        return {
+            'status': self.status,
+            'stages': {stage: round(seconds, 6) for stage, seconds in self.stages.items()},
+            'bytes': self.bytes,
+            'requests': self.requests,
+            'cache_hits': self.cache_hits,
+            'found': self.found,
+            'unclaimed': self.unclaimed,
+            'errors': dict(self.errors),
+        }
+
+@contextlib.contextmanager
+def stage(name):
+    """Times a block of work and adds it to the current store's metrics under the given stage."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics = _current_metrics.get()
+        if metrics is not None:
+            metrics.add_stage(name, time.perf_counter() - started)
+
+def record_error(error):
+    """Counts an error for the current store by exception type."""
+    metrics = _current_metrics.get()
+    if metrics is not None:
+        metrics.add_error(error)
+
+# Profilers of the worker threads while profile_scan() is running, None otherwise
+_thread_profilers = None
+
+def _run_profiled(func, *args):
+    """Runs func in the current thread, under its own profiler if a profiled scan is running."""
+    profilers = _thread_profilers
+    if profilers is None:
+        return func(*args)
+    import cProfile
+    profiler = cProfile.Profile()
+    profilers.append(profiler)
+    return profiler.runcall(func, *args)
+
+def submit_with_metrics(executor, func, *args):
+    """Submits work to a thread pool so it keeps reporting to the current store's metrics."""
+    return executor.submit(contextvars.copy_context().run, _run_profiled, func, *args)
+
+def _prometheus_label(value):
+    """Escapes a Prometheus label value."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def export_run_metrics(store_metrics, started_at, duration):
+    """Writes the JSON run report and the Prometheus textfile for one scan."""
+    if not METRICS_ENABLED:
+        return
+    report = {
+        'started_at': started_at.isoformat(timespec='seconds'),
+        'duration': round(duration, 6),
+        'stores': {name: metrics.as_dict() for name, metrics in store_metrics.items()},
+    }
+
+    gauges = [
+        ('claimer_scan_duration_seconds', "Wall-clock time of the whole scan.", [('', duration)]),
+        ('claimer_scan_timestamp_seconds', "When the last scan started.", [('', started_at.timestamp())]),
+    ]
+    stage_lines, store_lines = [], {key: [] for key in ('up', 'bytes', 'requests', 'hits', 'found', 'unclaimed', 'errors')}
+    for name, metrics in store_metrics.items():
+        store = f'store="{_prometheus_label(name)}"'
+        for stage_name, seconds in metrics.stages.items():
+            stage_lines.append((f'{{{store},stage="{_prometheus_label(stage_name)}"}}', seconds))
+        store_lines['up'].append((f'{{{store}}}', 1 if metrics.status == 'ok' else 0))
+        store_lines['bytes'].append((f'{{{store}}}', metrics.bytes))
+        store_lines['requests'].append((f'{{{store}}}', metrics.requests))
+        store_lines['hits'].append((f'{{{store}}}', metrics.cache_hits))
+        store_lines['found'].append((f'{{{store}}}', metrics.found))
+        store_lines['unclaimed'].append((f'{{{store}}}', metrics.unclaimed))
+        for error_type, count in metrics.errors.items():
+            store_lines['errors'].append((f'{{{store},type="{_prometheus_label(error_type)}"}}', count))
+    gauges += [
+        ('claimer_stage_seconds', "Time spent per store and scan stage.", stage_lines),
+        ('claimer_store_up', "1 if the store was checked successfully in the last scan.", store_lines['up']),
+        ('claimer_store_bytes', "Bytes downloaded from the store in the last scan.", store_lines['bytes']),
+        ('claimer_store_requests', "Requests made to the store in the last scan.", store_lines['requests']),
+        ('claimer_store_cache_hits', "Requests answered from the HTTP cache in the last scan.", store_lines['hits']),
+        ('claimer_store_results', "Free games found on the store in the last scan.", store_lines['found']),
+        ('claimer_store_unclaimed', "Unclaimed free games on the store in the last scan.", store_lines['unclaimed']),
+        ('claimer_store_errors', "Errors per store and exception type in the last scan.", store_lines['errors']),
+    ]
+    lines = []
+    for metric, help_text, samples in gauges:
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} gauge")
+        lines.extend(f"{metric}{labels} {value}" for labels, value in samples)
+
+    try:
+        os.makedirs(METRICS_DIR, exist_ok=True)
+        _write_atomic(METRICS_REPORT_PATH, json.dumps(report, indent=2))
+        _write_atomic(METRICS_PROM_PATH, "\n".join(lines) + "\n")
+    except Exception as e:
+        print(f"Warning: Could not write the scan metrics. Error: {e}")
+
+def profile_scan(func):
+    """
+    Runs func once under cProfile, saves the stats next to the metrics and prints the top entries.
+    Store threads get their own profilers, their stats are merged into the main one.
+    """
+    global _thread_profilers
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    _thread_profilers = []
+    try:
+        return profiler.runcall(func)
+    finally:
+        stats = pstats.Stats(profiler)
+        for thread_profiler in _thread_profilers:
+            try:
+                stats.add(thread_profiler)
+            except TypeError:
+                # A store that timed out may still be running, its profile isn't finished
+                continue
+        _thread_profilers = None
+        os.makedirs(METRICS_DIR, exist_ok=True)
+        path = os.path.join(METRICS_DIR, f"profile_{datetime.now():%Y%m%d_%H%M%S}.pstats")
+        stats.dump_stats(path)
+        print(f"\n📊 Profile saved to {path}")
+        stats.sort_stats('cumulative').print_stats(20)
+
+# --- HTTP FETCH LAYER ---
+
+FetchResult = namedtuple('FetchResult', ['text', 'status_code', 'from_cache'])
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    """Returns the shared pooled session used for every store request."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            session.headers.update(headers)
+            # Only connection problems are retried down here. Rate limits and server errors
+            # go back to fetch(), which backs off for the whole host and honors Retry-After
+            retry_options = dict(
+                total=HTTP_RETRIES,
+                status=0,
+                backoff_factor=HTTP_BACKOFF_FACTOR,
+                allowed_methods=frozenset(['GET', 'HEAD']),
+                raise_on_status=False,
+            )
+            try:
+                retry = Retry(backoff_jitter=HTTP_BACKOFF_FACTOR, **retry_options)
+            except TypeError:
+                # urllib3 1.26 has no backoff_jitter, retry without it
+                retry = Retry(**retry_options)
+            adapter = HTTPAdapter(max_retries=retry, pool_connections=8, pool_maxsize=8)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _session = session
+    return _session
+
+def _cache_paths(url):
+    """Returns the (meta, body) file paths used to cache a URL."""
+    key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+    return os.path.join(HTTP_CACHE_DIR, key + '.json'), os.path.join(HTTP_CACHE_DIR, key + '.body')
+
+def _write_atomic(path, data, mode='w'):
+    """Writes a file through a temporary copy so readers never see half-written content."""
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    encoding = None if 'b' in mode else 'utf-8'
+    with open(tmp_path, mode, encoding=encoding) as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def _load_cache_entry(url):
+    """Returns (meta, body) for a cached URL, or (None, None) if nothing usable is cached."""
+    if not HTTP_CACHE_ENABLED:
+        return None, None
+    meta_path, body_path = _cache_paths(url)
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        with open(body_path, 'r', encoding='utf-8') as f:
+            body = f.read()
+    except (OSError, ValueError):
+        return None, None
+    if meta.get('url') != url:
+        return None, None
+    # Meta and body are written separately, a mismatch means one of them is stale or damaged
+    if meta.get('digest') and meta['digest'] != hashlib.sha1(body.encode('utf-8')).hexdigest():
+        return None, None
+    return meta, body
+
+def _save_cache_entry(url, meta, body=None):
+    """Stores the cache metadata (and the body, if it changed) for a URL."""
+    if not HTTP_CACHE_ENABLED:
+        return
+    try:
+        os.makedirs(HTTP_CACHE_DIR, exist_ok=True)
+        meta_path, body_path = _cache_paths(url)
+        if body is not None:
+            _write_atomic(body_path, body)
+        _write_atomic(meta_path, json.dumps(meta))
+    except Exception as e:
+        print(f"Warning: Could not update the response cache for {url}. Error: {e}")
+
+def _parse_cache_control(value):
+    """Turns a Cache-Control header into a dict of lowercase directives."""
+    directives = {}
+    for part in (value or '').split(','):
+        name, _, arg = part.strip().partition('=')
+        if name:
+            directives[name.lower()] = arg.strip('"') if arg else True
+    return directives
+
+def _freshness_deadline(response_headers, now):
+    """Returns the epoch time until which a response may be reused without asking the server."""
+    directives = _parse_cache_control(response_headers.get('Cache-Control'))
+    if 'no-cache' in directives or 'no-store' in directives:
+        return 0
+    max_age = directives.get('max-age')
+    if max_age is not None:
+        try:
+            return now + max(0, int(max_age) - int(response_headers.get('Age', 0) or 0))
+        except ValueError:
+            return 0
+    if response_headers.get('Expires'):
+        try:
+            return parsedate_to_datetime(response_headers['Expires']).timestamp()
+        except (TypeError, ValueError):
+            return 0
+    return 0
+
+RETRYABLE_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+class HostUnavailable(requests.RequestException):
+    """Raised when a host is skipped because it keeps failing or asked us to wait."""
+
+class HostPolicy:
+    """
+    Politeness state for one host: a token bucket that spaces out requests, a shared
+    backoff so every thread waits after a 429/5xx, and a circuit breaker for hosts that keep failing.
+    """
+
+    def __init__(self, host, rate, burst):
+        self.host = host
+        self.rate = rate
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._failures = 0
+        self._open_until = 0.0
+        self._probing = False
+
+    def allow(self):
+        """False while the circuit is open. Once the cooldown is over a single trial request is let through."""
+        with self._lock:
+            if self._failures < CIRCUIT_FAILURE_THRESHOLD:
+                return True
+            if time.monotonic() < self._open_until or self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def acquire(self):
+        """Waits for a request token and for any backoff the host asked for."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                wait = self._blocked_until - now
+                if wait <= 0:
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def back_off(self, delay):
+        """Makes every request to this host wait at least delay seconds."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self, retry_after=None):
+        """Counts a failed request and opens the circuit once the host looks unhealthy."""
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self._failures >= CIRCUIT_FAILURE_THRESHOLD or retry_after:
+                self._failures = max(self._failures, CIRCUIT_FAILURE_THRESHOLD)
+                self._open_until = time.monotonic() + max(CIRCUIT_COOLDOWN, retry_after or 0)
+
+_host_policies = {}
+_host_policies_lock = threading.Lock()
+
+def host_policy(url):
+    """Returns the shared HostPolicy for the host of a URL."""
+    host = urlsplit(url).hostname or ''
+    with _host_policies_lock:
+        policy = _host_policies.get(host)
+        if policy is None:
+            rate, burst = HOST_RATE_LIMITS.get(host, DEFAULT_HOST_RATE_LIMIT)
+            policy = _host_policies[host] = HostPolicy(host, rate, burst)
+        return policy
+
+def _retry_after(response):
+    """Returns the Retry-After header of a response in seconds, or None."""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def _backoff_delay(attempt):
+    """Exponential backoff with full jitter, so parallel workers don't retry in lockstep."""
+    return random.uniform(0, min(HTTP_MAX_BACKOFF, HTTP_BACKOFF_FACTOR * (2 ** attempt)))
+
+def _polite_get(url, request_headers):
+    """
+    GETs a URL within the host's rate limit. 429 and 5xx responses are retried after the
+    Retry-After time (or a jittered backoff), which pauses the whole host, not just this request.
+    Returns (response, seconds spent waiting for the rate limit or a backoff), raises
+    HostUnavailable or requests.HTTPError when the host keeps failing.
+    """
+    policy = host_policy(url)
+    if not policy.allow():
+        raise HostUnavailable(f"{policy.host} is failing, skipped until it recovers")
+
+    waited = 0.0
+    for attempt in range(HTTP_RETRIES + 1):
+        # Waiting is its own stage, so throttling doesn't show up as slow downloads
+        wait_started = time.perf_counter()
+        with stage('wait'):
+            policy.acquire()
+        waited += time.perf_counter() - wait_started
+        try:
+            response = get_session().get(url, headers=request_headers, timeout=REQUEST_TIMEOUT)
+        except requests.RequestException:
+            # Any failure ends a trial request too, otherwise the circuit could never close again
+            policy.record_failure()
+            raise
+        if response.status_code not in RETRYABLE_STATUSES:
+            policy.record_success()
+            return response, waited
+
+        retry_after = _retry_after(response)
+        if retry_after is not None and retry_after > HTTP_MAX_BACKOFF:
+            # Not worth blocking a scan for, skip the host until it wants to hear from us again
+            policy.record_failure(retry_after)
+            response.raise_for_status()
+        if attempt == HTTP_RETRIES:
+            break
+        policy.back_off(retry_after if retry_after is not None else _backoff_delay(attempt))
+
+    policy.record_failure()
+    response.raise_for_status()
+
+def _wire_bytes(response):
+    """Returns the body bytes actually transferred (still compressed), falling back to the decoded size."""
+    content = response.content # Makes sure the body has been read
+    try:
+        return response.raw.tell()
+    except Exception:
+        return len(content)
+
+def fetch(url):
+    """
+    Fetches a URL through the shared session and the on-disk response cache.
+    Fresh cache entries are reused directly, stale ones are revalidated with ETag/Last-Modified.
+    If the host is failing, the last good cached copy is returned instead.
+    Raises requests.HTTPError for error responses when there's nothing cached to fall back on.
+    """
+    now = time.time()
+    metrics = _current_metrics.get()
+    meta, body = _load_cache_entry(url)
+    if meta and meta.get('fresh_until', 0) > now:
+        if metrics is not None:
+            metrics.add_request(0, from_cache=True)
+        return FetchResult(body, 200, True)
+
+    request_headers = {}
+    if meta:
+        if meta.get('etag'):
+            request_headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            request_headers['If-Modified-Since'] = meta['last_modified']
+
+    started = time.perf_counter()
+    try:
+        response, waited = _polite_get(url, request_headers)
+    except requests.RequestException as e:
+        if body is None:
+            raise
+        # Serve the last known good copy, the error is still counted for the store
+        print(f"⚠️ {urlsplit(url).hostname} is unavailable ({e}), using the last good response.")
+        record_error(e)
+        if metrics is not None:
+            metrics.add_request(0, from_cache=True)
+        return FetchResult(body, 200, True)
+    if metrics is not None:
+        # elapsed runs until the response headers arrive (connect, TLS and server time), the rest is reading the body
+        total = time.perf_counter() - started - waited
+        ttfb = min(response.elapsed.total_seconds(), total)
+        metrics.add_stage('ttfb', ttfb)
+        metrics.add_stage('download', total - ttfb)
+        metrics.add_request(_wire_bytes(response), from_cache=response.status_code == 304)
+
+    if response.status_code == 304 and meta:
+        meta['fresh_until'] = _freshness_deadline(response.headers, now)
+        meta['etag'] = response.headers.get('ETag', meta.get('etag'))
+        meta['last_modified'] = response.headers.get('Last-Modified', meta.get('last_modified'))
+        _save_cache_entry(url, meta)
+        return FetchResult(body, 304, True)
+
+    response.raise_for_status()
+    text = response.text
+
+    if 'no-store' not in _parse_cache_control(response.headers.get('Cache-Control')):
+        _save_cache_entry(url, {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'fresh_until': _freshness_deadline(response.headers, now),
+            'digest': hashlib.sha1(text.encode('utf-8')).hexdigest(),
+        }, text)
+    return FetchResult(text, response.status_code, False)
+
+def fetch_parsed(url, parser):
+    """
+    Fetches a URL and runs parser(text) on it, reusing the previous parse result
+    when the page came from the cache unchanged. Parse results must be lists of tuples.
+    """
+    return parse_cached(url, fetch(url), parser)
+
+def parse_cached(url, result, parser):
+    """Runs parser(text) on an already fetched FetchResult, reusing the stored result if the page was unchanged."""
+    meta, _ = _load_cache_entry(url) if result.from_cache else (None, None)
+    parser_name = getattr(parser, '__name__', repr(parser))
+
+    if meta and meta.get('parsed', {}).get('parser') == parser_name:
+        return [tuple(item) for item in meta['parsed']['items']]
+
+    with stage('parse'):
+        items = parser(result.text)
+
+    meta, _ = _load_cache_entry(url)
+    if meta:
+        meta['parsed'] = {'parser': parser_name, 'items': [list(item) for item in items]}
+        _save_cache_entry(url, meta)
+    return items
+
+# --- GAME CHECKER FUNCTIONS (Updated Epic) ---
+
+# Start/end times of every Epic free promotion seen in the last successful Epic check
+EPIC_PROMOTION_BOUNDARIES = []
+
+# Derived data for every Epic catalog element, so unchanged elements aren't evaluated again.
+# Each region gets its own file, e.g. epic_catalog_cache_US.json
+EPIC_INCREMENTAL = True
+EPIC_CACHE_FILE = os.path.join(CLAIMER_DIR, 'epic_catalog_cache.json')
+EPIC_CACHE_VERSION = 1
+
+# Countries of the free Epic offers found in the last check, by store URL,
+# and the regions that were checked successfully
+EPIC_REGION_AVAILABILITY = {}
+EPIC_REGIONS_CHECKED = []
+
+def parse_epic_date(date_str):
+    """Parses ISO date string from Epic API and returns a timezone-aware datetime object."""
+    try:
+        # datetime.fromisoformat handles the 'Z' in Python 3.11+, 
+        # but for broader compatibility, we handle it manually.
+        if date_str.endswith('Z'):
+            date_str = date_str.rstrip('Z')
+        
+        # Parse, then set the timezone to UTC (since Epic's API dates are in UTC/Z)
+        dt = datetime.fromisoformat(date_str)
+        return dt.replace(tzinfo=timezone.utc)
+    except ValueError:
+        # Handle cases with or without milliseconds
+        if '.' in date_str:
+            return datetime.strptime(date_str.split('.')[0], "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc)
+        return datetime.strptime(date_str, "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc)
+
+
+def get_epic_free_windows(game_data):
+    """Returns the (start, end) datetimes of every 100% off promotion of an Epic catalog element."""
+    windows = []
+    promotions = game_data.get('promotions')
+
+    # Check both current and *immediate* upcoming offers
+    for offer_type in ['promotionalOffers', 'upcomingPromotionalOffers']:
+        offer_list = promotions.get(offer_type, []) if promotions else []
+        if not offer_list:
+            continue
+
+        for offer_group in offer_list:
+            for offer in offer_group.get('promotionalOffers', []):
+                discount = offer.get('discountSetting', {}).get('discountPercentage')
+                start_date_str = offer.get('startDate')
+                end_date_str = offer.get('endDate')
+
+                if discount == 0 and start_date_str and end_date_str: # 100% free
+                    try:
+                        windows.append((parse_epic_date(start_date_str), parse_epic_date(end_date_str)))
+                    except Exception:
+                        # Silently skip on date parsing error
+                        continue
+    return windows
+
+def next_epic_change(now_utc=None):
+    """Returns the next time an Epic free promotion starts or ends, or None if nothing is scheduled."""
+    now_utc = now_utc or datetime.now(timezone.utc)
+    upcoming = [boundary for boundary in EPIC_PROMOTION_BOUNDARIES if boundary > now_utc]
+    return min(upcoming) if upcoming else None
+
+def _epic_element_key(game_data):
+    """Returns a stable key for an Epic catalog element."""
+    if game_data.get('id'):
+        return f"{game_data.get('namespace', '')}:{game_data['id']}"
+    return f"title:{game_data.get('title', '')}"
+
+def evaluate_epic_element(game_data):
+    """
+    Derives everything the scan needs from one Epic catalog element: title, store URL,
+    whether the price object shows it as free, and its 100% off windows as epoch timestamps.
+    """
+    title = game_data.get('title', 'Unknown Title')
+
+    # 1. Get the best possible URL slug (Prioritize human-readable slug from mappings)
+    product_slug = None
+    
+    # 1a. **PRIORITY**: Check the 'mappings' which often contain the clean, human-readable slug.
+    if game_data.get('catalogNs', {}).get('mappings'):
+        for mapping in game_data['catalogNs']['mappings']:
+            # Look for the primary store page slug
+            if mapping.get('pageType') in ['productHome', 'product']:
+                temp_slug = mapping.get('pageSlug')
+                # Heuristic: Prefer the clean slug (contains hyphens or is short) over a long UUID slug.
+                if temp_slug and ('-' in temp_slug or len(temp_slug) < 15): 
+                    product_slug = temp_slug
+                    break # Found a good candidate, stop looking in mappings
+    
+    # 1b. FALLBACK: Use generic product/url slugs if no good mapping was found (this often gives the UUID)
+    if not product_slug:
+        if game_data.get("productSlug"):
+            product_slug = game_data["productSlug"]
+        elif game_data.get("urlSlug"):
+            product_slug = game_data["urlSlug"]
+
+    game_url = None
+    if product_slug:
+        # Clean the slug and form the URL
+        slug_base = product_slug.split('/')[0] if '/' in product_slug else product_slug
+        game_url = f"https://store.epicgames.com/en-US/p/{slug_base}"
+
+    # 2. **PRIMARY CHECK:** Check if the price object itself indicates 100% off.
+    price_data = game_data.get('price', {}).get('totalPrice', {})
+    # If the price object shows a discount of 100% and it's not a permanently free game (original price > 0)
+    price_free = price_data.get('discountPercentage') == 0 and (price_data.get('originalPrice') or 0) > 0
+
+    # 3. **SECONDARY CHECK:** Fallback to the complex promotions object if primary check fails.
+    # Every 100% off window is kept, so the daemon knows when the next one opens or closes.
+    windows = [
+        [start_date.timestamp(), end_date.timestamp()]
+        for start_date, end_date in get_epic_free_windows(game_data)
+    ]
+
+    return {
+        'title': title,
+        'url': game_url,
+        'price_free': price_free,
+        'windows': windows,
+    }
+
+def _epic_entry_free_now(entry, now_ts):
+    """
+    Checks whether a cached Epic entry is inside one of its free windows.
+    The answer is cached until the next window boundary, so it's only recomputed when one is crossed.
+    """
+    if 'checked_at' in entry and entry['checked_at'] <= now_ts:
+        # valid_until is None when no window boundary is left in the future
+        if entry['valid_until'] is None or now_ts < entry['valid_until']:
+            return entry['free_now'], False
+
+    free_now = any(start <= now_ts < end for start, end in entry['windows'])
+    later = [boundary for window in entry['windows'] for boundary in window if boundary > now_ts]
+    entry['free_now'] = free_now
+    entry['checked_at'] = now_ts
+    entry['valid_until'] = min(later) if later else None
+    return free_now, True
+
+def _load_epic_cache(path):
+    """Loads the derived Epic catalog cache, or an empty one if it's missing or disabled."""
+    empty = {'digest': None, 'order': [], 'elements': {}}
+    if not EPIC_INCREMENTAL:
+        return empty
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return empty
+    if cache.get('version') != EPIC_CACHE_VERSION:
+        return empty
+    return cache
+
+def _save_epic_cache(cache, path):
+    """Writes the derived Epic catalog cache back to disk."""
+    if not EPIC_INCREMENTAL:
+        return
+    try:
+        cache['version'] = EPIC_CACHE_VERSION
+        _write_atomic(path, json.dumps(cache))
+    except Exception as e:
+        print(f"Warning: Could not save the Epic catalog cache. Error: {e}")
+
+def epic_region_url(locale, country):
+    """Returns the Epic promotions endpoint for one region, based on EPIC_API."""
+    parts = urlsplit(EPIC_API)
+    query = dict(parse_qsl(parts.query))
+    query.update({'locale': locale, 'country': country, 'allowCountries': country})
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+def _epic_cache_path(country):
+    """Returns the incremental cache file for one Epic region."""
+    base, ext = os.path.splitext(EPIC_CACHE_FILE)
+    return f"{base}_{country}{ext}"
+
+def _scan_epic_region(locale, country, now_ts):
+    """
+    Fetches and evaluates the Epic catalog of one region.
+    Returns (key, entry, is_currently_free) for every catalog element, in catalog order.
+    """
+    text = fetch(epic_region_url(locale, country)).text
+    with stage('parse'):
+        digest = hashlib.sha1(text.encode('utf-8')).hexdigest()
+        cache = _load_epic_cache(_epic_cache_path(country))
+        cache_changed = False
+
+        if cache['digest'] != digest:
+            # The response changed: only elements whose content differs get evaluated again
+            data = json.loads(text)
+            elements = data.get('data', {}).get('Catalog', {}).get('searchStore', {}).get('elements', [])
+
+            old_entries = cache['elements']
+            new_entries = {}
+            order = []
+            for game_data in elements:
+                key = _epic_element_key(game_data)
+                content_hash = hashlib.sha1(json.dumps(game_data, sort_keys=True).encode('utf-8')).hexdigest()
+                entry = old_entries.get(key)
+                if entry is None or entry.get('hash') != content_hash:
+                    entry = evaluate_epic_element(game_data)
+                    entry['hash'] = content_hash
+                new_entries[key] = entry
+                order.append(key)
+            cache = {'digest': digest, 'order': order, 'elements': new_entries}
+            cache_changed = True
+
+        entries = []
+        for key in cache['order']:
+            entry = cache['elements'][key]
+            is_currently_free = entry['price_free']
+            if entry['url'] and not is_currently_free:
+                is_currently_free, rechecked = _epic_entry_free_now(entry, now_ts)
+                cache_changed = cache_changed or rechecked
+            entries.append((key, entry, is_currently_free))
+
+        if cache_changed:
+            _save_epic_cache(cache, _epic_cache_path(country))
+    return entries
+
+def iter_epic_free_games():
+    """
+    Yields all currently active 100% free-to-claim games from the Epic Games Store API.
+    Uses multi-stage checking and timezone-aware date comparison for max resilience.
+    Catalog elements that haven't changed since the last scan are taken from the on-disk cache.
+    With several EPIC_REGIONS, the regions are fetched side by side and offers are merged by Epic id,
+    so nothing is yielded before every region has answered.
+    """
+    global EPIC_PROMOTION_BOUNDARIES, EPIC_REGION_AVAILABILITY, EPIC_REGIONS_CHECKED
+    print("🛍️ Checking Epic Games Store (using max resilience API method)...")
+    boundaries = set()
+    availability = {}
+    now_ts = datetime.now(timezone.utc).timestamp()
+    regions = EPIC_REGIONS
+
+    def region_results():
+        if len(regions) == 1:
+            locale, country = regions[0]
+            yield country, lambda: _scan_epic_region(locale, country, now_ts)
+            return
+        with ThreadPoolExecutor(max_workers=min(EPIC_REGION_WORKERS, len(regions)), thread_name_prefix="epic-region") as executor:
+            futures = [
+                (country, submit_with_metrics(executor, _scan_epic_region, locale, country, now_ts))
+                for locale, country in regions
+            ]
+            for country, future in futures:
+                yield country, future.result
+
+    merged = {}
+    succeeded = []
+    announced = {} # Every free window of every element, for the promotion schedule
+    for country, get_entries in region_results():
+        try:
+            entries = get_entries()
+        except requests.RequestException as e:
+            record_error(e)
+            print(f"❌ Error checking Epic Games Store {country} (Network/API issue): {e}")
+            continue
+        except Exception as e:
+            record_error(e)
+            print(f"❌ An unexpected error occurred while parsing Epic Games data for {country}: {e}")
+            continue
+        succeeded.append(country)
+
+        for key, entry, is_currently_free in entries:
+            boundaries.update(boundary for window in entry['windows'] for boundary in window)
+            for start, end in entry['windows']:
+                announced[(key, start)] = (key, entry['title'], entry['url'], start, end)
+            if entry['url'] and is_currently_free:
+                # The same offer in several regions is merged by its Epic id
+                if key not in merged:
+                    merged[key] = entry
+                availability.setdefault(entry['url'], []).append(country)
+
+    if succeeded:
+        EPIC_PROMOTION_BOUNDARIES = [datetime.fromtimestamp(boundary, timezone.utc) for boundary in sorted(boundaries)]
+        EPIC_REGION_AVAILABILITY = availability
+        EPIC_REGIONS_CHECKED = succeeded
+        record_promotions('epic', announced.values(), now_ts)
+
+    # 4. Yield every free game, claimed ones are filtered by the caller
+    for entry in merged.values():
+        yield entry['title'], entry['url']
+
+def get_epic_free_games():
+    """Returns all currently active 100% free-to-claim games from the Epic Games Store API."""
+    return list(iter_epic_free_games())
+
+def epic_regions_label(url):
+    """Returns ' (only in DE, FR)' for Epic offers that aren't free in every checked region, else ''."""
+    countries = EPIC_REGION_AVAILABILITY.get(url)
+    if not countries or len(EPIC_REGIONS_CHECKED) < 2 or len(countries) == len(EPIC_REGIONS_CHECKED):
+        return ''
+    return f" (only in {', '.join(countries)})"
+
+
+_html_parser_name = None
+
+STEAM_ROW_CLASS = re.compile(r'\bsearch_result_row\b')
+
+def html_parser():
+    """Returns the fastest BeautifulSoup parser available: lxml if it's installed, otherwise html.parser."""
+    global _html_parser_name
+    if _html_parser_name is None:
+        _html_parser_name = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+    return _html_parser_name
+
+def parse_steam_html(html):
+    """Extracts free (title, url) pairs from Steam search result rows."""
+    games = []
+    # Only the result rows are built into a tree, the rest of the page is skipped while parsing.
+    # The class is matched with a regex because rows carry several classes and the strainer
+    # sees the raw attribute value.
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    only_rows = SoupStrainer('a', class_=STEAM_ROW_CLASS)
+    soup = BeautifulSoup(html, html_parser(), parse_only=only_rows)
+    for game in soup.find_all('a', class_=STEAM_ROW_CLASS):
+        title_tag = game.find('span', class_='title')
+        link = game.get('href')
+        if not title_tag or not link:
+            continue
+        # Check for "Free" or similar in the price container
+        price_tag = game.find('div', class_='discount_final_price') or game.find('div', class_='search_price')
+        if price_tag and ('Free' in price_tag.text or '$0.00' in price_tag.text):
+            games.append((title_tag.text.strip(), link.split('?')[0])) # Clean the URL
+    return games
+
+def parse_steam_page(text):
+    """Extracts free (title, url) pairs from one page of Steam's JSON search results."""
+    return parse_steam_html(json.loads(text).get('results_html', ''))
+
+def _steam_page_url(start):
+    """Returns the JSON search results URL for the page starting at the given offset."""
+    return f"{STEAM_SEARCH_API}&start={start}&count={STEAM_PAGE_SIZE}"
+
+def _fetch_steam_page(start):
+    """Fetches and parses one page of Steam search results."""
+    url = _steam_page_url(start)
+    return parse_cached(url, fetch(url), parse_steam_page)
+
+def _iter_steam_results():
+    """
+    Yields free Steam games page by page as they are parsed. The first page tells us how many
+    results there are, the remaining pages are fetched a few at a time.
+    """
+    seen = set()
+
+    def new_games(games):
+        for title, url in games:
+            if url not in seen:
+                seen.add(url)
+                yield title, url
+
+    first_url = _steam_page_url(0)
+    first = fetch(first_url)
+    total = json.loads(first.text).get('total_count') or 0
+    yield from new_games(parse_cached(first_url, first, parse_steam_page))
+
+    starts = list(range(STEAM_PAGE_SIZE, min(total, STEAM_PAGE_SIZE * STEAM_MAX_PAGES), STEAM_PAGE_SIZE))
+    if not starts:
+        return
+
+    with ThreadPoolExecutor(max_workers=STEAM_PAGE_WORKERS, thread_name_prefix="steam-page") as executor:
+        futures = [submit_with_metrics(executor, _fetch_steam_page, start) for start in starts]
+        try:
+            for future in as_completed(futures):
+                yield from new_games(future.result())
+        finally:
+            for future in futures:
+                future.cancel()
+
+def iter_steam_free_games():
+    """
+    Checks every page of Steam's free specials for games listed as 'Free', yielding them as each page is parsed.
+    ⚠️ NOTE: Web scraping is **fragile** and may break if Steam updates its site layout.
+    """
+    print("🔥 Checking Steam Store (web scraping, potentially fragile)...")
+    try:
+        yield from _iter_steam_results()
+    except Exception as e:
+        record_error(e)
+        print(f"❌ Error checking Steam: {e}")
+
+def get_steam_free_games():
+    """Returns every free game on Steam's free specials pages."""
+    return list(iter_steam_free_games())
+
+def parse_gog_html(html):
+    """Extracts the giveaway (title, url) pair from the GOG front page, if there is one."""
+    from bs4 import BeautifulSoup
+
+    games = []
+    soup = BeautifulSoup(html, html_parser())
+    # Look for giveaway sections
+    giveaway_section = soup.select_one('.product-tile-container--giveaway')
+    if giveaway_section:
+        link_tag = giveaway_section.select_one('a')
+        title_tag = giveaway_section.select_one('.product-tile__title')
+        if link_tag and title_tag:
+            title = title_tag.text.strip() + " (GOG GIVEAWAY)"
+            link = "https://www.gog.com" + link_tag['href']
+            games.append((title, link))
+    return games
+
+def iter_gog_free_games():
+    """
+    Attempts to scrape the main GOG page for a giveaway banner.
+    ⚠️ NOTE: GOG's site is highly dynamic. This method is highly **unreliable**.
+    """
+    print("🌙 Checking GOG.com (web scraping, highly unreliable)...")
+    try:
+        yield from fetch_parsed(GOG_URL, parse_gog_html)
+    except Exception as e:
+        record_error(e)
+        print(f"❌ Error checking GOG: {e}")
+
+def get_gog_free_games():
+    """Returns the current GOG giveaway, if there is one."""
+    return list(iter_gog_free_games())
+
+def parse_ubisoft_html(html):
+    """Extracts free (title, url) pairs from the Ubisoft free games page."""
+    from bs4 import BeautifulSoup
+
+    games = []
+    soup = BeautifulSoup(html, html_parser())
+    # Look for product tiles where the price is free
+    for card in soup.select("div.product-tile"):
+        price_tag = card.select_one("div.product-tile__price span")
+        if price_tag and 'free' in price_tag.text.lower():
+            title_tag = card.select_one("span.product-tile-title")
+            link_tag = card.find("a", href=True)
+            if title_tag and link_tag:
+                title = title_tag.text.strip()
+                url = "https://store.ubisoft.com" + link_tag['href']
+                games.append((title, url))
+    return games
+
+def iter_ubisoft_free_games():
+    """
+    Attempts to scrape the Ubisoft free games page.
+    ⚠️ NOTE: Web scraping is **fragile** and may break if Ubisoft updates its site layout.
+    """
+    print("🎮 Checking Ubisoft Store (web scraping, potentially fragile)...")
+    try:
+        yield from fetch_parsed(UBISOFT_URL, parse_ubisoft_html)
+    except Exception as e:
+        record_error(e)
+        print(f"❌ Error checking Ubisoft: {e}")
+
+def get_ubisoft_free_games():
+    """Returns the free games listed on the Ubisoft free games page."""
+    return list(iter_ubisoft_free_games())
+
+# --- PROMOTION SCHEDULE ---
+
+# Every free window seen on a store is kept in the claim database, so the schedule can be shown without refetching
+RECORD_PROMOTIONS = True
+
+# How far ahead the schedule view looks for expiring giveaways (hours)
+SCHEDULE_EXPIRING_HOURS = 24
+SCHEDULE_UPCOMING_LIMIT = 10
+
+Promotion = namedtuple('Promotion', ['store', 'offer_id', 'title', 'url', 'start', 'end'])
+
+# Guarded by _claims_lock like everything else that uses the shared claim database connection
+_promotion_schedule = None # Built from the database on first use, dropped whenever new windows are recorded
+
+def _ensure_promotions_table(db):
+    db.executescript("""
+        CREATE TABLE IF NOT EXISTS promotions (
+            store TEXT NOT NULL,
+            offer_id TEXT NOT NULL,
+            title TEXT NOT NULL,
+            url TEXT,
+            start REAL NOT NULL,
+            end REAL NOT NULL,
+            seen_at REAL NOT NULL,
+            PRIMARY KEY (store, offer_id, start)
+        );
+    """)
+
+def record_promotions(store, windows, now_ts=None):
+    """
+    Saves the free windows a store currently announces, as (offer_id, title, url, start, end) tuples.
+    Windows that haven't ended yet but aren't announced anymore are dropped, past ones are kept as history.
+    """
+    global _promotion_schedule
+    if not RECORD_PROMOTIONS:
+        return
+    now_ts = now_ts if now_ts is not None else time.time()
+    try:
+        with _claims_lock:
+            db = _open_claims_db()
+            _ensure_promotions_table(db)
+            with db:
+                db.execute("DELETE FROM promotions WHERE store = ? AND end > ?", (store, now_ts))
+                db.executemany(
+                    "INSERT OR REPLACE INTO promotions (store, offer_id, title, url, start, end, seen_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(store, offer_id, title, url, start, end, now_ts) for offer_id, title, url, start, end in windows],
+                )
+            _promotion_schedule = None
+    except Exception as e:
+        print(f"Warning: Could not save the promotion schedule. Error: {e}")
+
+class PromotionSchedule:
+    """
+    Read-only index over promotion windows. Windows are sorted by start and laid out as an implicit
+    interval tree (each inner node knows the latest end below it), so "free at" queries only visit
+    branches that can still contain a match. A second list sorted by end answers "expires within".
+    Windows are half-open: free from start, no longer free at end.
+    """
+
+    def __init__(self, promotions):
+        self.items = sorted(promotions, key=lambda p: (p.start, p.end))
+        self.starts = [p.start for p in self.items]
+        self.ends = [p.end for p in self.items]
+        self.by_end = sorted(range(len(self.items)), key=self.ends.__getitem__)
+        self.sorted_ends = [self.ends[i] for i in self.by_end]
+        self._build_tree()
+
+    def _build_tree(self):
+        # Leaves sit at even positions, the node at i on level k has its children at i -/+ 2^(k-1)
+        n = len(self.items)
+        self.max_end = list(self.ends)
+        last_i, last = 0, 0.0
+        for i in range(0, n, 2):
+            last_i, last = i, self.ends[i]
+        level = 1
+        while (1 << level) <= n:
+            half = 1 << (level - 1)
+            for i in range((1 << level) - 1, n, 1 << (level + 1)):
+                right = self.max_end[i + half] if i + half < n else last
+                self.max_end[i] = max(self.ends[i], self.max_end[i - half], right)
+            # Track the rightmost node of this level, it stands in for children past the end of the array
+            last_i = last_i - half if (last_i >> level) & 1 else last_i + half
+            if last_i < n:
+                last = max(last, self.max_end[last_i])
+            level += 1
+        self.max_level = level - 1
+
+    def overlapping(self, lo, hi):
+        """Returns the windows with start <= hi and end > lo, sorted by start."""
+        n = len(self.items)
+        if not n:
+            return []
+        found = []
+        stack = [((1 << self.max_level) - 1, self.max_level, False)]
+        while stack:
+            i, level, visited = stack.pop()
+            if level <= 2:
+                # Small subtrees are cheaper to scan than to walk
+                first = i >> level << level
+                for j in range(first, min(first + (1 << (level + 1)) - 1, n)):
+                    if self.starts[j] > hi:
+                        break
+                    if self.ends[j] > lo:
+                        found.append(j)
+            elif not visited:
+                stack.append((i, level, True))
+                left = i - (1 << (level - 1))
+                if left >= n or self.max_end[left] > lo:
+                    stack.append((left, level - 1, False))
+            elif i < n and self.starts[i] <= hi:
+                if self.ends[i] > lo:
+                    found.append(i)
+                stack.append((i + (1 << (level - 1)), level - 1, False))
+        return [self.items[j] for j in sorted(found)]
+
+    def free_at(self, ts):
+        """Windows that are running at ts."""
+        return self.overlapping(ts, ts)
+
+    def upcoming(self, ts, limit=None):
+        """Windows starting after ts, soonest first."""
+        first = bisect.bisect_right(self.starts, ts)
+        last = len(self.items) if limit is None else first + limit
+        return self.items[first:last]
+
+    def expiring(self, ts, hours):
+        """Windows running at ts that end within the given number of hours, soonest first."""
+        first = bisect.bisect_right(self.sorted_ends, ts)
+        last = bisect.bisect_right(self.sorted_ends, ts + hours * 3600)
+        return [self.items[i] for i in self.by_end[first:last] if self.starts[i] <= ts]
+
+def promotion_schedule():
+    """Returns the PromotionSchedule of every recorded window, loading it from the database if needed."""
+    global _promotion_schedule
+    with _claims_lock:
+        if _promotion_schedule is None:
+            db = _open_claims_db()
+            _ensure_promotions_table(db)
+            rows = db.execute("SELECT store, offer_id, title, url, start, end FROM promotions").fetchall()
+            _promotion_schedule = PromotionSchedule([Promotion(*row) for row in rows])
+        return _promotion_schedule
+
+def show_schedule():
+    """Prints what's free now, what expires soon and what becomes free next, from the recorded windows."""
+    schedule = promotion_schedule()
+    now_ts = time.time()
+
+    def when(ts):
+        return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M")
+
+    print("\n--- Giveaway Schedule 📅 ---")
+    if not schedule.items:
+        print("Nothing recorded yet. Run a scan first (only Epic announces its giveaways ahead of time).")
+        input("\nPress ENTER to return to menu.")
+        return
+
+    free_now = schedule.free_at(now_ts)
+    print(f"\n🎁 Free right now ({len(free_now)}):")
+    for promo in free_now:
+        print(f"- {promo.title} [{promo.store}] until {when(promo.end)}")
+
+    expiring = schedule.expiring(now_ts, SCHEDULE_EXPIRING_HOURS)
+    if expiring:
+        print(f"\n⌛ Ending within {SCHEDULE_EXPIRING_HOURS} hours:")
+        for promo in expiring:
+            hours_left = (promo.end - now_ts) / 3600
+            print(f"- {promo.title} [{promo.store}] ends {when(promo.end)} ({hours_left:.1f}h left)")
+
+    upcoming = schedule.upcoming(now_ts, SCHEDULE_UPCOMING_LIMIT)
+    print(f"\n🔜 Coming up:")
+    if not upcoming:
+        print("- Nothing announced yet.")
+    for promo in upcoming:
+        print(f"- {promo.title} [{promo.store}] free from {when(promo.start)} to {when(promo.end)}")
+    input("\nPress ENTER to return to menu.")
+
+# --- SCAN HISTORY ---
+
+# Every scan is appended to monthly files of fixed-size records: (unix time, store id, title id).
+# Store names and titles are stored once in append-only dictionaries, their line number is their id.
+HISTORY_DIR = os.path.join(CLAIMER_DIR, 'history')
+HISTORY_STORES_FILE = os.path.join(HISTORY_DIR, 'stores.txt')
+HISTORY_TITLES_FILE = os.path.join(HISTORY_DIR, 'titles.jsonl')
+HISTORY_RECORD = struct.Struct('<IBI')
+HISTORY_CHECK_MARKER = 0 # Title id recorded once per successfully checked store, so scans without games count too
+HISTORY_READ_RECORDS = 4096 # Records read per chunk when querying
+RECORD_HISTORY = True
+
+_history_lock = threading.Lock()
+_history_dictionaries = None # (stores, titles) _HistoryDictionary objects, created on the first write
+
+try:
+    import fcntl
+except ImportError: # Windows
+    fcntl = None
+    import msvcrt
+
+@contextlib.contextmanager
+def _history_file_lock():
+    """Holds an exclusive lock on the history folder, so several claimer processes can write to it in turn."""
+    with open(os.path.join(HISTORY_DIR, '.lock'), 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+class _HistoryDictionary:
+    """
+    An append-only dictionary file, one entry per line, where an entry's line number is its id.
+    refresh() picks up lines other processes appended since the last read. Writers call it (and add())
+    only while holding the history file lock, so ids stay the same for every writer.
+    """
+
+    def __init__(self, path, parse):
+        self.path = path
+        self.parse = parse
+        self.entries = []
+        self.ids = {}
+        self.offset = 0
+
+    def refresh(self, repair=False):
+        try:
+            with open(self.path, 'r+b') as f:
+                f.seek(self.offset)
+                data = f.read()
+                complete = data.rfind(b'\n') + 1
+                if repair and complete < len(data):
+                    # A writer died halfway through a line; we hold the lock, so drop the fragment
+                    f.truncate(self.offset + complete)
+        except FileNotFoundError:
+            return self
+        for line in data[:complete].decode('utf-8').splitlines():
+            entry = self.parse(line)
+            self.entries.append(entry)
+            self.ids.setdefault(entry, len(self.entries))
+        self.offset += complete
+        return self
+
+    def add(self, entry, line):
+        """Returns the id of an entry, appending it to the file first if it's new."""
+        if entry not in self.ids:
+            data = (line + "\n").encode('utf-8')
+            with open(self.path, 'ab') as f:
+                f.write(data)
+            self.entries.append(entry)
+            self.ids[entry] = len(self.entries)
+            self.offset += len(data)
+        return self.ids[entry]
+
+def _history_file(ts):
+    return os.path.join(HISTORY_DIR, datetime.fromtimestamp(ts, timezone.utc).strftime('scans-%Y-%m.bin'))
+
+def _parse_history_title(line):
+    return tuple(json.loads(line))
+
+def _load_history_dictionaries():
+    """Returns (store names, titles) lists; a store's or title's position + 1 is its id."""
+    stores = _HistoryDictionary(HISTORY_STORES_FILE, str).refresh()
+    titles = _HistoryDictionary(HISTORY_TITLES_FILE, _parse_history_title).refresh()
+    return stores.entries, titles.entries
+
+def _last_history_timestamp(f):
+    """Returns the timestamp of the last whole record in an open history file, or 0. Drops a torn record at the end."""
+    f.seek(0, os.SEEK_END)
+    size = f.tell()
+    if size % HISTORY_RECORD.size:
+        size -= size % HISTORY_RECORD.size
+        f.truncate(size)
+    if not size:
+        return 0
+    f.seek(size - HISTORY_RECORD.size)
+    return HISTORY_RECORD.unpack(f.read(HISTORY_RECORD.size))[0]
+
+def record_scan_history(store_results):
+    """
+    Appends one scan to the history: a record per game found, plus a check marker for every store
+    that finished normally. store_results is a dict of store name -> (status, games).
+    The scan is stamped when it's written, under the history lock and always after the previous scan,
+    so every file stays in time order even with parallel scans, several processes or a clock going back.
+    """
+    global _history_dictionaries
+    if not RECORD_HISTORY:
+        return
+    try:
+        with _history_lock:
+            os.makedirs(HISTORY_DIR, exist_ok=True)
+            if _history_dictionaries is None:
+                _history_dictionaries = (
+                    _HistoryDictionary(HISTORY_STORES_FILE, str),
+                    _HistoryDictionary(HISTORY_TITLES_FILE, _parse_history_title),
+                )
+            stores, titles = _history_dictionaries
+
+            with _history_file_lock():
+                # Another process (e.g. --serve next to a menu scan) may have added entries meanwhile
+                stores.refresh(repair=True)
+                titles.refresh(repair=True)
+
+                scan_ts = int(time.time())
+                path = _history_file(scan_ts)
+                with open(path, 'a+b') as f:
+                    # Each scan gets its own second, so scans can be told apart when counting
+                    scan_ts = max(scan_ts, _last_history_timestamp(f) + 1)
+
+                records = bytearray()
+                for name, (status, games) in store_results.items():
+                    store_id = stores.add(name, name)
+                    if store_id > 255:
+                        raise ValueError("more than 255 stores in the scan history")
+                    if status == 'ok':
+                        records += HISTORY_RECORD.pack(scan_ts, store_id, HISTORY_CHECK_MARKER)
+                    for title, url in games:
+                        title_id = titles.add((title, url), json.dumps([title, url], ensure_ascii=False))
+                        records += HISTORY_RECORD.pack(scan_ts, store_id, title_id)
+
+                # One write per scan, so a crash can't leave half a record behind in practice
+                with open(path, 'ab') as f:
+                    f.write(records)
+    except Exception as e:
+        print(f"Warning: Could not update the scan history. Error: {e}")
+
+def _history_month_files(since, until):
+    """Returns the monthly history files that can contain records between the two timestamps."""
+    try:
+        names = sorted(name for name in os.listdir(HISTORY_DIR) if name.startswith('scans-') and name.endswith('.bin'))
+    except FileNotFoundError:
+        return []
+    first = os.path.basename(_history_file(since)) if since is not None else ''
+    last = os.path.basename(_history_file(until)) if until is not None else '~'
+    return [os.path.join(HISTORY_DIR, name) for name in names if first <= name <= last]
+
+def _first_record_at(f, size, ts):
+    """Binary searches a history file (records are in time order) for the first record at or after ts."""
+    lo, hi = 0, size // HISTORY_RECORD.size
+    while lo < hi:
+        mid = (lo + hi) // 2
+        f.seek(mid * HISTORY_RECORD.size)
+        if HISTORY_RECORD.unpack(f.read(HISTORY_RECORD.size))[0] < ts:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+def iter_history(since=None, until=None):
+    """Yields (timestamp, store id, title id) records between two unix times (until is exclusive), in chunks."""
+    for path in _history_month_files(since, until):
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            size -= size % HISTORY_RECORD.size # Ignore a torn record at the end
+            start = _first_record_at(f, size, since) if since is not None else 0
+            f.seek(start * HISTORY_RECORD.size)
+            remaining = size - start * HISTORY_RECORD.size
+            while remaining > 0:
+                chunk = f.read(min(remaining, HISTORY_READ_RECORDS * HISTORY_RECORD.size))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                for record in HISTORY_RECORD.iter_unpack(chunk):
+                    if until is not None and record[0] >= until:
+                        return
+                    yield record
+
+def parse_history_date(value):
+    """Turns a YYYY-MM-DD (or full ISO) local date into a unix timestamp, for argparse."""
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a date: {value!r} (use YYYY-MM-DD)")
+
+def query_history(since=None, until=None, stores=None, title=None):
+    """
+    Prints per store how often it was checked, how many of those checks had giveaways and which titles showed up.
+    With a title, lists the matching titles with when they were first and last seen instead.
+    Only counters are kept in memory, the records themselves are streamed.
+    """
+    store_names, titles = _load_history_dictionaries()
+    wanted_stores = None
+    if stores:
+        wanted = {STORE_PROVIDERS[key].name if key in STORE_PROVIDERS else key for key in stores}
+        wanted_stores = {number for number, name in enumerate(store_names, 1) if name in wanted}
+    wanted_titles = None
+    if title:
+        needle = title.lower()
+        wanted_titles = {number for number, (name, _) in enumerate(titles, 1) if needle in name.lower()}
+
+    checks = defaultdict(int)
+    scans_with_games = defaultdict(int)
+    sightings = defaultdict(int)
+    last_scan_counted = {}
+    title_stats = {} # title id -> [store id, first seen, last seen, times seen]
+
+    for ts, store_id, title_id in iter_history(since, until):
+        if wanted_stores is not None and store_id not in wanted_stores:
+            continue
+        if title_id == HISTORY_CHECK_MARKER:
+            checks[store_id] += 1
+            continue
+        if wanted_titles is not None and title_id not in wanted_titles:
+            continue
+        sightings[store_id] += 1
+        if last_scan_counted.get(store_id) != ts:
+            last_scan_counted[store_id] = ts
+            scans_with_games[store_id] += 1
+        stats = title_stats.get(title_id)
+        if stats is None:
+            title_stats[title_id] = [store_id, ts, ts, 1]
+        else:
+            stats[2] = ts
+            stats[3] += 1
+
+    def when(ts):
+        return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M")
+
+    def store_name(store_id):
+        return store_names[store_id - 1] if store_id <= len(store_names) else f"store #{store_id}"
+
+    if title:
+        print(f"\n--- Scan History: titles matching '{title}' ---")
+        if not title_stats:
+            print("Never seen in the selected time range.")
+        for title_id, (store_id, first, last, seen) in sorted(title_stats.items(), key=lambda item: item[1][2], reverse=True):
+            name, url = titles[title_id - 1]
+            print(f"- {name} [{store_name(store_id)}] first seen {when(first)}, last seen {when(last)}, in {seen} scan(s)")
+        return
+
+    print("\n--- Scan History ---")
+    print(f"{'Store':<16}{'Checks':>8}{'With games':>12}{'Share':>8}{'Sightings':>11}{'Titles':>8}")
+    titles_per_store = defaultdict(int)
+    for store_id, _, _, _ in title_stats.values():
+        titles_per_store[store_id] += 1
+    for store_id in sorted(set(checks) | set(sightings)):
+        share = f"{scans_with_games[store_id] / checks[store_id]:.0%}" if checks[store_id] else "-"
+        print(f"{store_name(store_id):<16}{checks[store_id]:>8}{scans_with_games[store_id]:>12}{share:>8}"
+              f"{sightings[store_id]:>11}{titles_per_store[store_id]:>8}")
+    if not checks and not sightings:
+        print("No scans recorded in the selected time range.")
+
+# --- STORE PROVIDERS ---
+
+# A store the scan engine can check. `scanner` is a function returning or yielding (title, url) pairs,
+# or a "module:function" string that is only imported the first time the store is scanned.
+# Generators are preferred, their games are shown while the other stores are still being checked.
+StoreProvider = namedtuple('StoreProvider', ['key', 'name', 'scanner', 'url'])
+
+# Registered stores by key, in display order
+STORE_PROVIDERS = {}
+
+# Keys of the stores to check, None means all registered stores (set with --stores)
+SELECTED_STORES = None
+
+def register_store(key, name, scanner, url=None):
+    """Adds a store to the registry, so scans pick it up without any other changes."""
+    STORE_PROVIDERS[key] = StoreProvider(key, name, scanner, url)
+
+def _resolve_scanner(provider):
+    """Returns the provider's scanner function, importing it first if it was registered by name."""
+    scanner = provider.scanner
+    if isinstance(scanner, str):
+        module_name, _, function_name = scanner.partition(':')
+        scanner = getattr(importlib.import_module(module_name), function_name)
+        STORE_PROVIDERS[provider.key] = provider._replace(scanner=scanner)
+    return scanner
+
+def store_scanners(keys=None):
+    """
+    Returns (name, scanner) pairs for the given store keys, or for every registered store.
+    Unknown keys raise ValueError.
+    """
+    if keys is None:
+        keys = list(STORE_PROVIDERS)
+    unknown = [key for key in keys if key not in STORE_PROVIDERS]
+    if unknown:
+        raise ValueError(f"Unknown store(s): {', '.join(unknown)}. Available: {', '.join(STORE_PROVIDERS)}")
+
+    def lazy(provider):
+        # Import on first call, inside the scan thread, so a slow import counts against the store
+        return lambda: _resolve_scanner(provider)()
+
+    return [(STORE_PROVIDERS[key].name, lazy(STORE_PROVIDERS[key])) for key in keys]
+
+register_store('epic', "Epic Games", iter_epic_free_games, EPIC_API)
+register_store('steam', "Steam", iter_steam_free_games, STEAM_SEARCH_API)
+register_store('gog', "GOG.com", iter_gog_free_games, GOG_URL)
+register_store('ubisoft', "Ubisoft", iter_ubisoft_free_games, UBISOFT_URL)
+
+# --- OUTPUT PIPELINE ---
+
+# Found games are handed to a background queue and delivered to one or more sinks in batches,
+# so a slow webhook or notification never holds up a scan
+OUTPUT_BATCH_SIZE = 5
+OUTPUT_BATCH_WAIT = 1.0 # How long a sink waits for more games before sending a short batch (seconds)
+OUTPUT_QUEUE_SIZE = 1000 # Games waiting per sink, anything beyond that is dropped with a warning
+
+# Shortest time between two batches per sink type, so webhooks and notifications aren't flooded (seconds)
+OUTPUT_MIN_INTERVALS = {
+    'browser': 0,
+    'webhook': 1,
+    'desktop': 5,
+    'file': 0,
+}
+
+# Every batch gets its own page, so a batch opened right after another can't overwrite it before the browser reads it
+OUTPUT_PAGES_DIR = os.path.join(CLAIMER_DIR, 'claim_pages')
+OUTPUT_PAGES_KEEP = 20 # Older pages are deleted
+
+# Unattended runs (--once, --daemon) remember what each output already got, so a cron job or a restart
+# doesn't send the same giveaway again. After this many days an offer counts as new again (a re-run giveaway)
+OUTPUT_REMEMBER_DAYS = 30
+OUTPUT_FILE_PATH = os.path.join(CLAIMER_DIR, 'found_games.jsonl')
+
+class BrowserSink:
+    """Writes each batch to its own local page of claim links and opens that page once."""
+    kind = 'browser'
+
+    def __init__(self, pages_dir=None):
+        self.pages_dir = pages_dir or OUTPUT_PAGES_DIR
+        self._counter = itertools.count(1)
+
+    def _prune_pages(self):
+        pages = sorted(name for name in os.listdir(self.pages_dir) if name.startswith('claim_batch-'))
+        for name in pages[:-OUTPUT_PAGES_KEEP]:
+            try:
+                os.remove(os.path.join(self.pages_dir, name))
+            except OSError:
+                pass
+
+    def deliver(self, batch):
+        rows = "\n".join(
+            f'<li><a href="{html.escape(game["url"])}" target="_blank" rel="noopener">'
+            f'{html.escape(game["title"])}</a> <small>{html.escape(game["store"])}</small></li>'
+            for game in batch
+        )
+        page = (
+            "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>Free games to claim</title></head>\n"
+            f"<body><h1>🎮 {len(batch)} free games to claim</h1>\n<ul>\n{rows}\n</ul></body></html>\n"
+        )
+        os.makedirs(self.pages_dir, exist_ok=True)
+        name = f"claim_batch-{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}-{next(self._counter):04d}.html"
+        path = os.path.join(self.pages_dir, name)
+        _write_atomic(path, page)
+        webbrowser.open(pathlib.Path(path).resolve().as_uri())
+        self._prune_pages()
+
+class WebhookSink:
+    """POSTs each batch as JSON to a URL (Discord/Slack relays, Home Assistant, ...)."""
+    kind = 'webhook'
+
+    def __init__(self, url):
+        self.url = url
+
+    def deliver(self, batch):
+        response = get_session().post(self.url, json={'games': batch}, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+
+class DesktopSink:
+    """Shows one desktop notification per batch, using notify-send (Linux) or osascript (macOS)."""
+    kind = 'desktop'
+
+    def deliver(self, batch):
+        summary = f"🎮 {len(batch)} free game(s) to claim"
+        body = "\n".join(f"{game['title']} ({game['store']})" for game in batch)
+        if shutil.which('notify-send'):
+            subprocess.run(['notify-send', summary, body], check=True, timeout=10)
+        elif shutil.which('osascript'):
+            def quote(text):
+                # AppleScript strings only know \\ and \" escapes, everything else is passed through as is
+                return '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
+            script = f"display notification {quote(body)} with title {quote(summary)}"
+            subprocess.run(['osascript', '-e', script], check=True, timeout=10)
+        else:
+            print(f"🔔 {summary}:\n{body}")
+
+class FileSink:
+    """Appends every game to a JSON Lines file."""
+    kind = 'file'
+
+    def __init__(self, path=None):
+        self.path = path or OUTPUT_FILE_PATH
+
+    def deliver(self, batch):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for game in batch:
+                f.write(json.dumps(game, ensure_ascii=False) + "\n")
+
+def parse_sink(spec):
+    """
+    Builds a sink from a command line spec: 'browser', 'desktop', 'file', 'file:PATH' or 'webhook:URL'.
+    Raises ValueError for anything else.
+    """
+    kind, _, target = spec.partition(':')
+    kind = kind.strip().lower()
+    if kind == 'browser':
+        return BrowserSink()
+    if kind == 'desktop':
+        return DesktopSink()
+    if kind == 'file':
+        return FileSink(target or None)
+    if kind == 'webhook' and target:
+        return WebhookSink(target)
+    raise ValueError(f"Unknown output '{spec}'. Use browser, desktop, file[:PATH] or webhook:URL.")
+
+def _sink_id(sink):
+    """Identifies a sink's destination, e.g. 'webhook:https://...' or 'desktop'."""
+    target = getattr(sink, 'url', None) or getattr(sink, 'path', None)
+    return f"{sink.kind}:{target}" if target else sink.kind
+
+def _delivery_key(game):
+    """Returns the (store, offer id) a delivered game is remembered by."""
+    return offer_key(game['url']) or (game['store'], normalize_title(game['title']))
+
+def _ensure_deliveries_table(db):
+    db.executescript("""
+        CREATE TABLE IF NOT EXISTS deliveries (
+            sink TEXT NOT NULL,
+            store TEXT NOT NULL,
+            offer_id TEXT NOT NULL,
+            delivered_at REAL NOT NULL,
+            PRIMARY KEY (sink, store, offer_id)
+        );
+    """)
+
+def load_deliveries(sink_id):
+    """Returns the (store, offer id) keys delivered to a sink within the last OUTPUT_REMEMBER_DAYS."""
+    try:
+        with _claims_lock:
+            db = _open_claims_db()
+            _ensure_deliveries_table(db)
+            since = time.time() - OUTPUT_REMEMBER_DAYS * 86400
+            rows = db.execute(
+                "SELECT store, offer_id FROM deliveries WHERE sink = ? AND delivered_at >= ?", (sink_id, since)
+            ).fetchall()
+        return set(rows)
+    except Exception as e:
+        print(f"Warning: Could not read what was already sent to {sink_id}. Error: {e}")
+        return set()
+
+def save_deliveries(sink_id, keys):
+    """Remembers that these (store, offer id) keys reached a sink, and forgets ones past OUTPUT_REMEMBER_DAYS."""
+    now = time.time()
+    try:
+        with _claims_lock:
+            db = _open_claims_db()
+            _ensure_deliveries_table(db)
+            with db:
+                db.executemany(
+                    "INSERT OR REPLACE INTO deliveries (sink, store, offer_id, delivered_at) VALUES (?, ?, ?, ?)",
+                    [(sink_id, store, offer_id, now) for store, offer_id in keys],
+                )
+                db.execute("DELETE FROM deliveries WHERE delivered_at < ?", (now - OUTPUT_REMEMBER_DAYS * 86400,))
+    except Exception as e:
+        print(f"Warning: Could not remember what was sent to {sink_id}. Error: {e}")
+
+class _SinkWorker:
+    """
+    Background thread that batches and rate-limits the games for one sink. With remember=True,
+    games this sink already got (in this or an earlier run) are skipped, and successful deliveries are saved.
+    """
+
+    def __init__(self, sink, batch_size, batch_wait, remember=False):
+        self.sink = sink
+        self.sink_id = _sink_id(sink)
+        self.remember = remember
+        self._seen = load_deliveries(self.sink_id) if remember else set()
+        self._seen_lock = threading.Lock()
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.min_interval = OUTPUT_MIN_INTERVALS.get(sink.kind, 0)
+        self.queue = queue.Queue(maxsize=OUTPUT_QUEUE_SIZE)
+        self.delivered = 0
+        self.failed = 0
+        self._last_sent = 0.0
+        self._thread = threading.Thread(target=self._run, name=f"output-{sink.kind}", daemon=True)
+        self._thread.start()
+
+    def _next_batch(self):
+        """Waits for the first game, then gathers more until the batch is full or the wait runs out."""
+        first = self.queue.get()
+        if first is None:
+            return None, True
+        batch = [first]
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.batch_size:
+            try:
+                game = self.queue.get(timeout=max(0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if game is None:
+                return batch, True
+            batch.append(game)
+        return batch, False
+
+    def _send(self, batch):
+        wait = self._last_sent + self.min_interval - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        try:
+            self.sink.deliver(batch)
+            self.delivered += len(batch)
+            if self.remember:
+                save_deliveries(self.sink_id, [_delivery_key(game) for game in batch])
+        except Exception as e:
+            self.failed += len(batch)
+            print(f"❌ Couldn't send {len(batch)} game(s) to {self.sink.kind}: {e}")
+            if self.remember:
+                # Not delivered, so the next scan may try these again
+                with self._seen_lock:
+                    self._seen.difference_update(_delivery_key(game) for game in batch)
+        self._last_sent = time.monotonic()
+
+    def _run(self):
+        while True:
+            batch, stop = self._next_batch()
+            if batch:
+                self._send(batch)
+                for _ in batch:
+                    self.queue.task_done()
+            if stop:
+                self.queue.task_done()
+                return
+
+    def put(self, game):
+        if self.remember:
+            key = _delivery_key(game)
+            with self._seen_lock:
+                if key in self._seen:
+                    return False
+                self._seen.add(key) # Also covers games still waiting in the queue
+        try:
+            self.queue.put_nowait(game)
+            return True
+        except queue.Full:
+            print(f"⚠️ Output queue for {self.sink.kind} is full, dropped: {game['title']}")
+            if self.remember:
+                with self._seen_lock:
+                    self._seen.discard(key)
+            return False
+
+    def flush(self):
+        self.queue.join()
+
+    def close(self, timeout=None):
+        self.queue.put(None)
+        self._thread.join(timeout)
+
+class OutputPipeline:
+    """
+    Fans found games out to several sinks. Each sink has its own queue and worker thread,
+    so submitting never waits for delivery and one slow sink doesn't hold up the others.
+    """
+
+    def __init__(self, sinks, batch_size=OUTPUT_BATCH_SIZE, batch_wait=OUTPUT_BATCH_WAIT, remember=False):
+        self.workers = [_SinkWorker(sink, batch_size, batch_wait, remember) for sink in sinks]
+
+    def submit(self, games):
+        """Queues (store, title, url) tuples for every sink and returns right away."""
+        found_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        for store, title, url in games:
+            game = {'store': store, 'title': title, 'url': url, 'found_at': found_at}
+            for worker in self.workers:
+                worker.put(game)
+
+    def flush(self):
+        """Waits until everything submitted so far has been delivered (or has failed)."""
+        for worker in self.workers:
+            worker.flush()
+
+    def close(self, timeout=None):
+        """Delivers what's left and stops the workers."""
+        for worker in self.workers:
+            worker.close(timeout)
+
+# --- CORE LOGIC ---
+
+def stream_stores(scanners=None, store_deadlines=None, scan_deadline=SCAN_DEADLINE):
+    """
+    Runs all store checks at the same time and yields their results as they come in:
+    ('game', name, (title, url)) for every game, then ('done', name, status) once per store,
+    where status is 'ok', 'timeout' or 'error'. A store that misses its deadline keeps the games it already found.
+    """
+    scanners = scanners if scanners is not None else store_scanners(SELECTED_STORES)
+    store_deadlines = store_deadlines if store_deadlines is not None else STORE_DEADLINES
+    if not scanners:
+        return
+
+    global LAST_SCAN_METRICS
+    store_metrics = {name: StoreMetrics(name) for name, _ in scanners}
+    LAST_SCAN_METRICS = store_metrics
+    events = queue.Queue()
+    stopped = set() # Stores whose results are no longer wanted, their scanners stop at the next game
+
+    def run_scanner(name, scanner):
+        _current_metrics.set(store_metrics[name])
+        status = 'ok'
+        games = None
+        try:
+            with stage('total'):
+                games = scanner()
+                for game in games or []:
+                    if name in stopped:
+                        break
+                    events.put(('game', name, game))
+        except Exception as e:
+            print(f"❌ Error checking {name}: {e}")
+            store_metrics[name].add_error(e)
+            status = 'error'
+        finally:
+            # Closing a generator early runs its cleanup, e.g. cancelling Steam pages still queued
+            if hasattr(games, 'close'):
+                games.close()
+            events.put(('done', name, status))
+
+    started = time.monotonic()
+    # All stores start together, so each deadline is measured from the same starting point
+    deadlines = {name: min(store_deadlines.get(name, DEFAULT_STORE_DEADLINE), scan_deadline) for name, _ in scanners}
+    found = {name: [] for name in deadlines}
+    statuses = {}
+    pending = set(deadlines)
+
+    def finish(name, status):
+        pending.discard(name)
+        stopped.add(name)
+        metrics = store_metrics[name]
+        # Scanners report their own errors, no games with errors means the check failed
+        if status == 'ok' and metrics.errors and not found[name]:
+            status = 'error'
+        metrics.status = status
+        metrics.found = len(found[name])
+        statuses[name] = status
+        return ('done', name, status)
+
+    executor = ThreadPoolExecutor(max_workers=len(scanners), thread_name_prefix="store-scan")
+    try:
+        for name, scanner in scanners:
+            executor.submit(contextvars.copy_context().run, _run_profiled, run_scanner, name, scanner)
+
+        while pending:
+            # Checked on every event, a store that keeps producing games must still hit its deadline
+            now = time.monotonic()
+            for name in sorted(pending, key=list(deadlines).index):
+                if started + deadlines[name] <= now:
+                    print(f"⏰ {name} didn't finish within {deadlines[name]}s, skipping the rest of it this time.")
+                    yield finish(name, 'timeout')
+            if not pending:
+                break
+            timeout = min(started + deadlines[name] for name in pending) - time.monotonic()
+            try:
+                kind, name, value = events.get(timeout=max(0, timeout))
+            except queue.Empty:
+                continue
+            if name not in pending:
+                continue # Arrived after the store's deadline
+            if kind == 'game':
+                found[name].append(value)
+                yield ('game', name, value)
+            else:
+                yield finish(name, value)
+    finally:
+        stopped.update(deadlines)
+        # Don't wait for stalled stores, their requests time out on their own
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    print(f"⏱️ Scan finished in {time.monotonic() - started:.1f}s.")
+    record_scan_history({name: (statuses[name], found[name]) for name in deadlines})
+
+def scan_stores(scanners=None, store_deadlines=None, scan_deadline=SCAN_DEADLINE):
+    """
+    Runs all store checks and collects whatever finishes before its deadline.
+    Returns a dict of store name -> (status, games), where status is 'ok', 'timeout' or 'error'.
+    """
+    games = defaultdict(list)
+    results = {}
+    for kind, name, value in stream_stores(scanners, store_deadlines, scan_deadline):
+        if kind == 'game':
+            games[name].append(value)
+        else:
+            results[name] = (value, games[name])
+    return results
+
+def iter_unclaimed():
+    """
+    Scans every store and yields the stream_stores() events, minus games that were already claimed.
+    Run metrics are exported once the scan is over.
+    """
+    # Load the claim index before the scan threads start using it
+    load_claimed_games()
+
+    started_at = datetime.now(timezone.utc)
+    started = time.monotonic()
+    unclaimed = defaultdict(int)
+
+    # Claimed games are dropped here for every store, the scan history still sees all of them
+    for kind, name, value in stream_stores():
+        metrics = LAST_SCAN_METRICS.get(name)
+        if kind == 'game':
+            filter_started = time.perf_counter()
+            claimed = is_claimed(*value)
+            if metrics is not None:
+                metrics.add_stage('filter', time.perf_counter() - filter_started)
+            if claimed:
+                continue
+            unclaimed[name] += 1
+        elif metrics is not None:
+            metrics.unclaimed = unclaimed[name]
+        yield kind, name, value
+
+    export_run_metrics(LAST_SCAN_METRICS, started_at, time.monotonic() - started)
+
+def show_scan(events, on_game=None):
+    """
+    Prints scan events as they arrive, so the first games show up as soon as the fastest store has them.
+    on_game(name, title, url) is called for every game. Returns (results, store_games): the status and
+    unclaimed games per store.
+    """
+    store_games = defaultdict(list)
+    results = {}
+    last_shown = None
+
+    for kind, name, value in events:
+        if kind == 'game':
+            title, url = value
+            store_games[name].append(value)
+            # Stores report in parallel, repeat the heading whenever the output switches stores
+            if last_shown != name:
+                print(f"\n💫 {name}")
+                last_shown = name
+            print(f"- {title}: {url}{epic_regions_label(url)}")
+            if on_game is not None:
+                on_game(name, title, url)
+            continue
+
+        results[name] = (value, store_games[name])
+        if value != 'ok':
+            print(f"\n⚠️ Couldn't finish checking {name} ({value}), results may be incomplete.")
+            last_shown = None
+        elif not store_games[name]:
+            print(f"\n😔 No new freebies on {name} right now.")
+            last_shown = None
+
+    return results, dict(store_games)
+
+def notify(config):
+    """Checks and opens links for unclaimed free games."""
+    print("\n🎮 Checking REAL free games only... ✨", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+
+    results, store_games = show_scan(iter_unclaimed())
+
+    all_games = [(name, title, url) for name, games in store_games.items() for title, url in games]
+
+    if all_games:
+        print(f"\n✨ Found {len(all_games)} unclaimed free games! Ready to open? Press ENTER to begin batch magic, or type 'no' to skip.")
+        newly_claimed = []
+        
+        games_to_open = list(all_games)
+        pipeline = OutputPipeline([BrowserSink()])
+        
+        while True:
+            choice = input("> ").strip().lower()
+            if choice == "no":
+                print("💤 Okayy, skipped this time...")
+                break
+            
+            if not games_to_open:
+                print("\nAll games already opened!")
+                input("Press ENTER to return to menu.")
+                break
+
+            # Process games in batches, each batch opens as a single page of links
+            batch = games_to_open[:OUTPUT_BATCH_SIZE]
+            games_to_open = games_to_open[OUTPUT_BATCH_SIZE:]
+
+            print(f"🌐 Opening next {len(batch)} games...")
+            for store, title, url in batch:
+                print(f"🔗 Opening: {title}")
+                newly_claimed.append((title, url))
+                
+                # --- LOGGING CLAIMED GAME ---
+                if config['logging_enabled']:
+                    log_claim(title, url)
+                # ----------------------------
+            pipeline.submit(batch)
+            pipeline.flush()
+
+            if games_to_open:
+                print(f"\n⏭️ {len(games_to_open)} more remaining. Press ENTER for next batch.")
+            else:
+                print("\n🎉 All done opening! Wasn't that fun?")
+                input("Press ENTER to wrap it up.")
+                break
+
+        pipeline.close()
+        flush_claim_log()
+        save_claimed_games(newly_claimed)
+    else:
+        print("\n😢 No new games today... we'll check again soon 💖")
+        input("\nPress ENTER to return to menu.")
+
+# --- DAEMON MODE ---
+
+# Longest sleep between two scans. Steam, GOG and Ubisoft publish no schedule,
+# so they are only re-checked this often (seconds)
+DAEMON_FALLBACK_INTERVAL = 6 * 60 * 60
+
+# Shortest sleep between two scans, so a burst of promotion boundaries can't hammer the stores (seconds)
+DAEMON_MIN_INTERVAL = 60
+
+# How long after a promotion starts or ends we check again, Epic's API needs a moment to catch up (seconds)
+DAEMON_BOUNDARY_GRACE = 5
+
+# If Epic hasn't updated yet when we wake up for a boundary, retry this often, this many times
+DAEMON_RETRY_DELAY = 30
+DAEMON_RETRY_ATTEMPTS = 5
+
+# How soon to try again when the Epic check itself failed (seconds)
+DAEMON_ERROR_DELAY = 5 * 60
+
+def next_scan_delay(now_utc, epic_status):
+    """
+    Works out how long the daemon should sleep before the next scan.
+    Returns (seconds, reason, boundary) where boundary is the Epic promotion time we wake up for, if any.
+    """
+    if epic_status != 'ok':
+        return DAEMON_ERROR_DELAY, "Epic check failed, retrying soon", None
+
+    boundary = next_epic_change(now_utc)
+    if boundary is not None:
+        seconds = (boundary - now_utc).total_seconds() + DAEMON_BOUNDARY_GRACE
+        if seconds <= DAEMON_FALLBACK_INTERVAL:
+            return max(DAEMON_MIN_INTERVAL, seconds), f"Epic promotion change at {boundary:%Y-%m-%d %H:%M} UTC", boundary
+
+    return DAEMON_FALLBACK_INTERVAL, "regular check for Steam, GOG and Ubisoft", None
+
+def sleep_until(wake_at):
+    """Sleeps until the given epoch time in short steps, so a suspended machine wakes up on time."""
+    while True:
+        remaining = wake_at - time.time()
+        if remaining <= 0:
+            return
+        time.sleep(min(remaining, 60))
+
+def run_daemon(once=False, sinks=None):
+    """
+    Runs unattended scans without any prompts. Instead of polling on a fixed timer it sleeps
+    until the next Epic promotion starts or ends, with a bounded fallback for the scraped stores.
+    New games are handed to the given output sinks in the background, each game once per sink
+    (remembered across runs for OUTPUT_REMEMBER_DAYS).
+    """
+    pipeline = OutputPipeline(sinks, remember=True) if sinks else None
+    try:
+        _daemon_loop(once, pipeline)
+    finally:
+        if pipeline:
+            pipeline.close()
+
+def _daemon_loop(once, pipeline):
+    if not once:
+        print("🤖 Running in daemon mode. Press Ctrl+C to stop.")
+    retries_left = 0
+    waiting_for = None
+    previous_epic = None
+
+    while True:
+        print("\n🎮 Checking REAL free games only... ✨", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        def deliver(name, title, url):
+            # Handed over right away, the pipeline batches them and skips what each sink already got
+            if pipeline:
+                pipeline.submit([(name, title, url)])
+
+        results, store_games = show_scan(iter_unclaimed(), on_game=deliver)
+
+        if once:
+            return
+
+        now_utc = datetime.now(timezone.utc)
+        epic_status = results.get('Epic Games', ('ok', []))[0]
+        epic_games = set(store_games.get('Epic Games', []))
+
+        # Epic's API sometimes lags behind the promotion start, so keep polling briefly until it changes
+        if waiting_for is not None and epic_games == previous_epic and retries_left > 0:
+            retries_left -= 1
+            delay, reason = DAEMON_RETRY_DELAY, f"Epic hasn't updated for {waiting_for:%H:%M} UTC yet"
+        else:
+            delay, reason, waiting_for = next_scan_delay(now_utc, epic_status)
+            retries_left = DAEMON_RETRY_ATTEMPTS if waiting_for is not None else 0
+        previous_epic = epic_games
+
+        wake_at = time.time() + delay
+        print(f"😴 Next check at {datetime.fromtimestamp(wake_at):%Y-%m-%d %H:%M:%S} ({reason}).")
+        sleep_until(wake_at)
+
+# --- SERVICE MODE ---
+
+# How long scan results are served from memory when nothing tells us better (seconds).
+# Epic results expire at the next promotion start/end instead, if that comes sooner.
+SERVICE_DEFAULT_TTL = 30 * 60
+SERVICE_MIN_TTL = 60
+
+# The scheduler refreshes entries this long before they expire, so clients rarely wait (seconds)
+SERVICE_REFRESH_AHEAD = 30
+
+SERVICE_HOST = '127.0.0.1'
+SERVICE_PORT = 8765
+
+class ScanCache:
+    """
+    In-memory scan results per store with expiry times. When several requests need the same
+    stale store at once, only the first one scans it and the others wait for that result.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._inflight = {}
+
+    def peek(self, key):
+        with self._lock:
+            return self._entries.get(key)
+
+    def get(self, key, force=False):
+        """Returns the cached entry for a store, scanning it first if it's missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and not force and entry['expires_at'] > time.time():
+                return entry
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if not owner:
+            return future.result()
+
+        try:
+            entry = _scan_store_entry(key)
+            with self._lock:
+                self._entries[key] = entry
+            future.set_result(entry)
+            return entry
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def next_expiry(self):
+        with self._lock:
+            return min((entry['expires_at'] for entry in self._entries.values()), default=None)
+
+def _store_ttl(key, status):
+    """Works out how long a store's results stay valid: until the next Epic promotion change, at most the default."""
+    if status != 'ok':
+        return SERVICE_MIN_TTL
+    ttl = SERVICE_DEFAULT_TTL
+    if key == 'epic':
+        boundary = next_epic_change()
+        if boundary is not None:
+            ttl = min(ttl, (boundary - datetime.now(timezone.utc)).total_seconds() + DAEMON_BOUNDARY_GRACE)
+    return max(SERVICE_MIN_TTL, ttl)
+
+def _scan_store_entry(key):
+    """Scans one store and turns the result into a cache entry."""
+    provider = STORE_PROVIDERS[key]
+    (status, games), = scan_stores(store_scanners([key])).values()
+    now = time.time()
+    return {
+        'store': provider.name,
+        'status': status,
+        'games': [{'title': title, 'url': url} for title, url in games],
+        'fetched_at': now,
+        'expires_at': now + _store_ttl(key, status),
+    }
+
+def _entry_json(entry):
+    """Formats a cache entry for the API."""
+    def iso(timestamp):
+        return datetime.fromtimestamp(timestamp, timezone.utc).isoformat(timespec='seconds')
+    return {
+        'store': entry['store'],
+        'status': entry['status'],
+        'games': entry['games'],
+        'fetched_at': iso(entry['fetched_at']),
+        'expires_at': iso(entry['expires_at']),
+    }
+
+class _ServiceHandler(BaseHTTPRequestHandler):
+    """JSON API: /health, /stores, /games and /games/<store>."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        cache = self.server.scan_cache
+        stores = self.server.store_keys
+        path = urlsplit(self.path).path.rstrip('/')
+        try:
+            if path == '/health':
+                self._send_json(200, {'status': 'ok'})
+            elif path == '/stores':
+                self._send_json(200, {key: STORE_PROVIDERS[key].name for key in stores})
+            elif path == '/games':
+                # Stale stores are refreshed side by side, each one still coalesced with other requests
+                futures = {key: self.server.executor.submit(cache.get, key) for key in stores}
+                self._send_json(200, {key: _entry_json(future.result()) for key, future in futures.items()})
+            elif path.startswith('/games/') and path[len('/games/'):] in stores:
+                self._send_json(200, _entry_json(cache.get(path[len('/games/'):])))
+            else:
+                self._send_json(404, {'error': 'not found'})
+        except Exception as e:
+            self._send_json(500, {'error': str(e)})
+
+def _refresh_scheduler(cache, store_keys, stop_event):
+    """Keeps every store's entry fresh, refreshing each one shortly before it expires."""
+    while not stop_event.is_set():
+        now = time.time()
+        for key in store_keys:
+            entry = cache.peek(key)
+            if entry is None or entry['expires_at'] - SERVICE_REFRESH_AHEAD <= now:
+                try:
+                    cache.get(key, force=True)
+                except Exception as e:
+                    print(f"❌ Scheduled refresh of {key} failed: {e}")
+        next_expiry = cache.next_expiry()
+        wait = SERVICE_MIN_TTL if next_expiry is None else next_expiry - SERVICE_REFRESH_AHEAD - time.time()
+        stop_event.wait(max(1, wait))
+
+def run_service(host=None, port=None):
+    """Serves cached scan results over a small local JSON API, refreshing them on a schedule."""
+    host = host or SERVICE_HOST
+    port = SERVICE_PORT if port is None else port
+    store_keys = SELECTED_STORES or list(STORE_PROVIDERS)
+
+    server = ThreadingHTTPServer((host, port), _ServiceHandler)
+    server.daemon_threads = True
+    server.scan_cache = ScanCache()
+    server.store_keys = store_keys
+    server.executor = ThreadPoolExecutor(max_workers=max(1, len(store_keys)), thread_name_prefix="service-scan")
+
+    stop_event = threading.Event()
+    scheduler = threading.Thread(
+        target=_refresh_scheduler, args=(server.scan_cache, store_keys, stop_event), daemon=True
+    )
+    scheduler.start()
+
+    print(f"🌐 Serving free games on http://{host}:{server.server_address[1]}/games (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nOkay, exiting...")
+    finally:
+        stop_event.set()
+        server.server_close()
+        server.executor.shutdown(wait=False, cancel_futures=True)
+
+# --- BENCHMARKS ---
+
+# Recorded store responses used by the offline benchmarks (see --record-fixtures)
+BENCH_FIXTURES_DIR = os.path.join(CLAIMER_DIR, 'fixtures')
+BENCH_FIXTURE_FILES = {
+    'epic': 'epic.json',
+    'steam': 'steam.json',
+    'gog': 'gog.html',
+    'ubisoft': 'ubisoft.html',
+}
+
+def record_fixtures():
+    """Saves the current live store responses, so the benchmarks can replay them offline."""
+    os.makedirs(BENCH_FIXTURES_DIR, exist_ok=True)
+    sources = {
+        'epic': EPIC_API,
+        'steam': f"{STEAM_SEARCH_API}&start=0&count={STEAM_PAGE_SIZE}",
+        'gog': GOG_URL,
+        'ubisoft': UBISOFT_URL,
+    }
+    for name, url in sources.items():
+        try:
+            response = get_session().get(url, timeout=REQUEST_TIMEOUT)
+            response.raise_for_status()
+            with open(os.path.join(BENCH_FIXTURES_DIR, BENCH_FIXTURE_FILES[name]), 'w', encoding='utf-8') as f:
+                f.write(response.text)
+            print(f"📼 Recorded {name}: {len(response.content):,} bytes")
+        except Exception as e:
+            print(f"❌ Could not record {name}: {e}")
+
+def _load_fixture(name):
+    """Returns a recorded fixture's content, or None if it hasn't been recorded."""
+    try:
+        with open(os.path.join(BENCH_FIXTURES_DIR, BENCH_FIXTURE_FILES[name]), 'r', encoding='utf-8') as f:
+            return f.read()
+    except OSError:
+        return None
+
+def _synthetic_epic(count):
+    """Builds an Epic promotions response with the given number of catalog elements."""
+    now_utc = datetime.now(timezone.utc)
+    def iso(dt):
+        return dt.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+    current = {'startDate': iso(now_utc - timedelta(days=1)), 'endDate': iso(now_utc + timedelta(days=6)),
+               'discountSetting': {'discountType': 'PERCENTAGE', 'discountPercentage': 0}}
+    upcoming = {'startDate': iso(now_utc + timedelta(days=6)), 'endDate': iso(now_utc + timedelta(days=13)),
+                'discountSetting': {'discountType': 'PERCENTAGE', 'discountPercentage': 0}}
+    elements = []
+    for i in range(count):
+        elements.append({
+            'title': f"Benchmark Game {i}",
+            'id': f"{i:032x}",
+            'namespace': f"ns{i % 97}",
+            'productSlug': f"benchmark-game-{i}",
+            'urlSlug': f"{i:032x}",
+            'catalogNs': {'mappings': [{'pageSlug': f"benchmark-game-{i}", 'pageType': 'productHome'}]},
+            'price': {'totalPrice': {'discountPrice': 1999, 'originalPrice': 1999, 'discount': 0,
+                                     'discountPercentage': 100, 'currencyCode': 'USD'}},
+            'promotions': {
+                'promotionalOffers': [{'promotionalOffers': [current]}] if i % 3 == 0 else [],
+                'upcomingPromotionalOffers': [{'promotionalOffers': [upcoming]}] if i % 3 == 1 else [],
+            },
+        })
+    return json.dumps({'data': {'Catalog': {'searchStore': {'elements': elements}}}})
+
+def _synthetic_steam_rows(start, count):
+    """Builds Steam search result rows, like the ones inside results_html."""
+    rows = []
+    for i in range(start, start + count):
+        rows.append(
+            f'<a href="https://store.steampowered.com/app/{i}/Benchmark_Game_{i}/?snr=1_7_7_2300_150_1" '
+            f'data-ds-appid="{i}" class="search_result_row ds_collapse_flag">'
+            f'<div class="col search_capsule"><img src="https://example.invalid/{i}.jpg"></div>'
+            f'<div class="responsive_search_name_combined"><div class="col search_name ellipsis">'
+            f'<span class="title">Benchmark Game {i}</span></div>'
+            f'<div class="col search_price_discount_combined responsive_secondrow">'
+            f'<div class="discount_block search_discount_block"><div class="discount_pct">-100%</div>'
+            f'<div class="discount_prices"><div class="discount_original_price">$19.99</div>'
+            f'<div class="discount_final_price">Free</div></div></div></div></div></a>'
+        )
+    return ''.join(rows)
+
+def _synthetic_steam_pages(total):
+    """Builds every page of a Steam JSON search result with the given number of rows."""
+    pages = {}
+    for start in range(0, max(total, 1), STEAM_PAGE_SIZE):
+        rows = _synthetic_steam_rows(start, min(STEAM_PAGE_SIZE, total - start))
+        pages[start] = json.dumps({'success': 1, 'results_html': rows, 'total_count': total, 'start': start})
+    return pages
+
+def _synthetic_gog():
+    """Builds a GOG front page with a giveaway tile surrounded by ordinary product tiles."""
+    tiles = ''.join(
+        f'<div class="product-tile"><a href="/en/game/game_{i}"><span class="product-tile__title">Game {i}</span></a></div>'
+        for i in range(300)
+    )
+    giveaway = ('<div class="product-tile-container--giveaway"><a href="/en/game/benchmark_giveaway">'
+                '<span class="product-tile__title">Benchmark Giveaway</span></a></div>')
+    return f"<html><head><title>GOG</title></head><body>{tiles}{giveaway}{tiles}</body></html>"
+
+def _synthetic_ubisoft(count):
+    """Builds an Ubisoft free games page with the given number of product tiles."""
+    tiles = ''.join(
+        f'<div class="product-tile"><a href="/us/game-{i}/{i:024x}.html">'
+        f'<span class="product-tile-title">Ubisoft Game {i}</span></a>'
+        f'<div class="product-tile__price"><span>{"Free" if i % 2 == 0 else "$9.99"}</span></div></div>'
+        for i in range(count)
+    )
+    return f"<html><body><div class='grid'>{tiles}</div></body></html>"
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    """Serves benchmark fixtures: /epic, /steam?start=N, /gog and /ubisoft."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        fixtures = self.server.fixtures
+        name = parts.path.strip('/')
+        body = fixtures.get(name)
+        if name == 'steam':
+            start = int(parse_qs(parts.query).get('start', ['0'])[0])
+            body = fixtures['steam'].get(start)
+        if body is None:
+            self.send_error(404)
+            return
+        data = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json' if name in ('epic', 'steam') else 'text/html')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+def _measure(func, repeat):
+    """
+    Runs func `repeat` times for timing, then once more under tracemalloc for memory.
+    Returns (best seconds, peak bytes, net allocated blocks, captured output).
+    """
+    times = []
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        for _ in range(repeat):
+            gc.collect()
+            started = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - started)
+
+        # Memory is measured in a separate run, tracemalloc slows everything down a lot
+        gc.collect()
+        blocks_before = sys.getallocatedblocks()
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        blocks = sys.getallocatedblocks() - blocks_before
+    return min(times), peak, blocks, output.getvalue()
+
+def run_benchmarks(repeat=3):
+    """
+    Runs every store parser against recorded (or synthetic) fixtures served from a local HTTP server,
+    plus synthetic scale-ups, and prints time, peak memory and allocations for each.
+    """
+    global EPIC_API, STEAM_SEARCH_API, GOG_URL, UBISOFT_URL, HTTP_CACHE_ENABLED, RECORD_PROMOTIONS
+    global EPIC_INCREMENTAL, EPIC_CACHE_FILE, STEAM_MAX_PAGES, _claimed_titles, _claimed_offers
+
+    def steam_recorded():
+        recorded = _load_fixture('steam')
+        if recorded is None:
+            return None
+        data = json.loads(recorded)
+        data['total_count'] = STEAM_PAGE_SIZE # Only the first page was recorded
+        return {0: json.dumps(data)}
+
+    failures = check_title_matching()
+    if failures:
+        for claimed, title, expected in failures:
+            print(f"❌ Title matching: '{title}' {'should' if expected else 'should not'} match claimed '{claimed}'")
+    else:
+        print(f"✅ Title matching: all {len(TITLE_MATCH_CHECKS)} checks passed.")
+
+    print("🧪 Preparing benchmark fixtures...")
+    recorded_epic, recorded_steam = _load_fixture('epic'), steam_recorded()
+    recorded_gog, recorded_ubisoft = _load_fixture('gog'), _load_fixture('ubisoft')
+    scenarios = [
+        ("Epic", 'epic', get_epic_free_games, {'epic': recorded_epic or _synthetic_epic(20)}, recorded_epic is not None),
+        ("Epic x10k elements", 'epic', get_epic_free_games, {'epic': _synthetic_epic(10000)}, False),
+        ("Epic x10k (incremental, warm)", 'epic-warm', get_epic_free_games, {'epic': _synthetic_epic(10000)}, False),
+        ("Steam", 'steam', get_steam_free_games, {'steam': recorded_steam or _synthetic_steam_pages(STEAM_PAGE_SIZE)}, recorded_steam is not None),
+        ("Steam x5k rows", 'steam', get_steam_free_games, {'steam': _synthetic_steam_pages(5000)}, False),
+        ("GOG", 'gog', get_gog_free_games, {'gog': recorded_gog or _synthetic_gog()}, recorded_gog is not None),
+        ("Ubisoft", 'ubisoft', get_ubisoft_free_games, {'ubisoft': recorded_ubisoft or _synthetic_ubisoft(60)}, recorded_ubisoft is not None),
+        ("Ubisoft x2k tiles", 'ubisoft', get_ubisoft_free_games, {'ubisoft': _synthetic_ubisoft(2000)}, False),
+    ]
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _FixtureHandler)
+    server.daemon_threads = True
+    server.fixtures = {}
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    saved = (EPIC_API, STEAM_SEARCH_API, GOG_URL, UBISOFT_URL, HTTP_CACHE_ENABLED, RECORD_PROMOTIONS,
+             EPIC_INCREMENTAL, EPIC_CACHE_FILE, STEAM_MAX_PAGES, _claimed_titles, _claimed_offers)
+    temp_dir = tempfile.mkdtemp(prefix='claimer_bench_')
+    EPIC_API = f"{base_url}/epic"
+    STEAM_SEARCH_API = f"{base_url}/steam?infinite=1"
+    GOG_URL = f"{base_url}/gog"
+    UBISOFT_URL = f"{base_url}/ubisoft"
+    HTTP_CACHE_ENABLED = False
+    RECORD_PROMOTIONS = False # Synthetic giveaways stay out of the real schedule
+    STEAM_MAX_PAGES = 10 ** 6
+    EPIC_CACHE_FILE = os.path.join(temp_dir, 'epic_catalog_cache.json')
+    # Benchmarks never touch the real claim history
+    _claimed_titles, _claimed_offers = TitleIndex(), set()
+    # The fixture server is local, rate limiting it would only measure the token bucket
+    HOST_RATE_LIMITS['127.0.0.1'] = (10 ** 6, 10 ** 6)
+
+    print(f"\n{'Parser':<32}{'Source':<11}{'Results':>8}{'Time (ms)':>12}{'Peak (KiB)':>12}{'Blocks':>10}")
+    print("-" * 85)
+    try:
+        for label, kind, scanner, fixtures, recorded in scenarios:
+            server.fixtures = fixtures
+            EPIC_INCREMENTAL = kind == 'epic-warm'
+            if EPIC_INCREMENTAL:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    scanner() # Fill the incremental cache first
+            games = []
+            seconds, peak, blocks, output = _measure(lambda: games.__setitem__(slice(None), scanner()), repeat)
+            source = "recorded" if recorded else "synthetic"
+            print(f"{label:<32}{source:<11}{len(games):>8}{seconds * 1000:>12.1f}{peak / 1024:>12.0f}{blocks:>10}")
+            for line in output.splitlines():
+                if line.startswith("❌"):
+                    print(f"   {line}")
+    finally:
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        HOST_RATE_LIMITS.pop('127.0.0.1', None)
+        _host_policies.pop('127.0.0.1', None)
+        (EPIC_API, STEAM_SEARCH_API, GOG_URL, UBISOFT_URL, HTTP_CACHE_ENABLED, RECORD_PROMOTIONS,
+         EPIC_INCREMENTAL, EPIC_CACHE_FILE, STEAM_MAX_PAGES, _claimed_titles, _claimed_offers) = saved
+    print(f"\nTime is the best of {repeat} runs. Peak memory and blocks come from one extra traced run.")
+
+# --- MENU FUNCTIONS ---
+
+def show_menu(logging_status):
+    """Displays the main menu."""
+    log_state = "ON 📝" if logging_status else "OFF 👻"
+    
+    print("\n--- Free Games Claimer Menu ---")
+    print("1. Start Claiming Games 🚀")
+    print(f"L. Toggle Claim Logging (Current Status: {log_state})")
+    print("V. View Claim Log 📄")
+    print("C. Clear Claim Log 🔥")
+    print("Z. Backup Claimer Files 💾 (to Downloads as ZIP)")
+    print("I. Incremental Backup 💾 (only stores what changed)")
+    print("R. Restore an Incremental Backup ♻️")
+    print("S. Giveaway Schedule 📅 (free now, ending soon, coming up)")
+    print("0. Exit 😢")
+    print("-----------------------------")
+
+def parse_args(argv=None):
+    """Parses the command line options. Without any options the interactive menu is shown."""
+    parser = argparse.ArgumentParser(description="Scans Epic, Steam, GOG and Ubisoft for free games.")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--daemon', action='store_true',
+                      help="keep running without prompts, re-checking when Epic promotions change")
+    mode.add_argument('--once', action='store_true',
+                      help="run a single scan without prompts and exit")
+    mode.add_argument('--backup', action='store_true',
+                      help="make an incremental backup of the claimer folder and exit")
+    mode.add_argument('--history', action='store_true',
+                      help="summarize the scan history per store (see --since, --until, --title, --stores)")
+    mode.add_argument('--serve', action='store_true',
+                      help="serve cached scan results over a local JSON API")
+    mode.add_argument('--benchmark', action='store_true',
+                      help="time every store parser offline against recorded or synthetic fixtures")
+    mode.add_argument('--record-fixtures', action='store_true',
+                      help="save the current store responses for --benchmark")
+    parser.add_argument('--stores', metavar='LIST',
+                        help="comma-separated stores to check, e.g. 'epic' or 'epic,steam' (default: all)")
+    parser.add_argument('--profile', action='store_true',
+                        help="run a single scan under cProfile and save the stats (implies --once)")
+    parser.add_argument('--output', action='append', metavar='SINK', default=[],
+                        help="where --daemon/--once send new games: browser, desktop, file[:PATH] or "
+                             "webhook:URL (repeat for several)")
+    parser.add_argument('--since', type=parse_history_date, metavar='DATE',
+                        help="--history: only scans on or after this date (YYYY-MM-DD)")
+    parser.add_argument('--until', type=parse_history_date, metavar='DATE',
+                        help="--history: only scans before this date (YYYY-MM-DD)")
+    parser.add_argument('--title', metavar='TEXT',
+                        help="--history: show when titles containing TEXT were first and last seen")
+    parser.add_argument('--host', default=SERVICE_HOST,
+                        help=f"address for --serve to listen on (default: {SERVICE_HOST})")
+    parser.add_argument('--port', type=int, default=SERVICE_PORT,
+                        help=f"port for --serve (default: {SERVICE_PORT})")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="how many times each benchmark runs (default: 3)")
+    return parser.parse_args(argv)
+
+# Main Execution
+if __name__ == "__main__":
+
+    args = parse_args()
+    if args.stores:
+        SELECTED_STORES = [key.strip().lower() for key in args.stores.split(',') if key.strip()]
+        try:
+            store_scanners(SELECTED_STORES)
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(2)
+    try:
+        sinks = [parse_sink(spec) for spec in args.output]
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(2)
+    if args.backup:
+        sys.exit(0 if create_incremental_backup() is not None else 1)
+    if args.history:
+        query_history(args.since, args.until, SELECTED_STORES, args.title)
+        sys.exit(0)
+    if args.serve:
+        run_service(args.host, args.port)
+        sys.exit(0)
+    if args.benchmark:
+        run_benchmarks(repeat=max(1, args.repeat))
+        sys.exit(0)
+    if args.record_fixtures:
+        record_fixtures()
+        sys.exit(0)
+    if args.profile:
+        profile_scan(lambda: run_daemon(once=True, sinks=sinks))
+        sys.exit(0)
+    if args.daemon or args.once:
+        try:
+            run_daemon(once=args.once, sinks=sinks)
+        except KeyboardInterrupt:
+            print("\nOkay, exiting...")
+        sys.exit(0)
+    
+    # 1. Load configuration
+    config = load_config()
+
+    # 2. Main menu loop
+    while True:
+        try:
+            show_menu(config['logging_enabled'])
+            choice = input("\nType your choice (1, L, V, C, Z, I, R, S, or 0): ").strip().upper()
+
+            if choice == '0':
+                print("Okay, exiting...")
+                break
+            
+            elif choice == '1':
+                notify(config)
+                
+            elif choice == 'L':
+                config['logging_enabled'] = not config['logging_enabled']
+                save_config(config)
+                log_state = "ON 📝" if config['logging_enabled'] else "OFF 👻"
+                print(f"\n📢 Logging is now **{log_state}**! Configuration saved.")
+                
+            elif choice == 'V':
+                view_log()
+                
+            elif choice == 'C':
+                clear_log()
+                
+            elif choice == 'Z':
+                create_backup()
+
+            elif choice == 'I':
+                create_incremental_backup()
+
+            elif choice == 'R':
+                choose_and_restore_backup()
+
+            elif choice == 'S':
+                show_schedule()
                 
             else:
                 print("That’s not on the list. Try again.")
@@ -495,4 +3641,4 @@ if __name__ == "__main__":
             print("Invalid input. Please enter a valid option.")
         except KeyboardInterrupt:
             print("\nOkay, exiting...")
-            breakss
+            break